@@ -1,3 +1,28 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Assessment, Choice, Question
+
+
+class QuestionInline(admin.TabularInline):
+    model = Question
+    extra = 1
+
+
+class ChoiceInline(admin.TabularInline):
+    model = Choice
+    extra = 1
+
+
+@admin.register(Assessment)
+class AssessmentAdmin(admin.ModelAdmin):
+    list_display = ("title", "assessment_type", "questions_count", "is_active")
+    list_filter = ("is_active", "assessment_type")
+    search_fields = ("title",)
+    inlines = [QuestionInline]
+
+
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "assessment", "order")
+    list_filter = ("assessment",)
+    inlines = [ChoiceInline]
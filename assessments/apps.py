@@ -5,3 +5,6 @@ class AssessmentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "assessments"
     verbose_name = "Assessments"
+
+    def ready(self):
+        from . import signals  # noqa: F401
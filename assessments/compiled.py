@@ -0,0 +1,103 @@
+"""Compiled assessment definitions.
+
+An assessment is compiled once into the question payload the take page renders
+plus flat choice arrays the scorer looks submissions up in. Compiled
+definitions are cached by assessments.definition_cache.
+"""
+import numpy as np
+
+from .models import Assessment
+from .scoring import score_answers
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+class CompiledAssessment:
+    def __init__(self, assessment, questions):
+        self.id = assessment.id
+        self.title = assessment.title
+        self.description = assessment.description
+        self.assessment_type = assessment.assessment_type
+        self.assessment_type_display = assessment.get_assessment_type_display()
+        self.questions_count = assessment.questions_count
+        self.time_required = assessment.time_required
+        self.is_active = assessment.is_active
+
+        # Rendered question payload, in display order
+        self.questions = [
+            {
+                'id': question.id,
+                'text': question.text,
+                'choices': [{'id': choice.id, 'text': choice.text} for choice in question.choices.all()],
+            }
+            for question in questions
+        ]
+        self.question_texts = [question['text'] for question in self.questions]
+
+        # One entry per choice, sorted by id for searchsorted lookups
+        choices = sorted(
+            ((choice.id, row, choice.value, float(choice.weight), choice.text)
+             for row, question in enumerate(questions)
+             for choice in question.choices.all()),
+            key=lambda choice: choice[0]
+        )
+        self.values = sorted({choice[2] for choice in choices})
+        value_codes = {value: code for code, value in enumerate(self.values)}
+        self.choice_ids = np.array([choice[0] for choice in choices], dtype=np.int64)
+        self.choice_rows = np.array([choice[1] for choice in choices], dtype=np.int64)
+        self.choice_values = np.array([value_codes[choice[2]] for choice in choices], dtype=np.int64)
+        self.choice_weights = np.array([choice[3] for choice in choices], dtype=np.float64)
+        self.choice_texts = [choice[4] for choice in choices]
+
+    def submitted_choice_ids(self, data):
+        """Choice id submitted for each question in order, -1 where missing or malformed"""
+        submitted = np.full(len(self.questions), -1, dtype=np.int64)
+        for row, question in enumerate(self.questions):
+            answer = data.get(f"question_{question['id']}")
+            # ASCII only: isdigit() alone also accepts digits such as '²' or '٣'
+            if answer and answer.isascii() and answer.isdigit():
+                choice_id = int(answer)
+                if choice_id <= INT64_MAX:
+                    submitted[row] = choice_id
+        return submitted
+
+    def resolve(self, submitted):
+        """Return (question rows, choice positions) of the valid answers in `submitted`"""
+        positions = np.searchsorted(self.choice_ids, submitted)
+        positions = np.minimum(positions, len(self.choice_ids) - 1)
+        rows = np.arange(len(submitted))
+        # A choice only counts for the question it belongs to
+        valid = (self.choice_ids[positions] == submitted) & (self.choice_rows[positions] == rows)
+        return rows[valid], positions[valid]
+
+    def score(self, data):
+        """Answers payload stored on AssessmentResult.score for a POSTed submission"""
+        if not len(self.choice_ids):
+            return {}
+
+        rows, positions = self.resolve(self.submitted_choice_ids(data))
+        return {
+            str(self.questions[row]['id']): {
+                'choice_id': int(self.choice_ids[position]),
+                'value': self.values[self.choice_values[position]],
+                'weight': float(self.choice_weights[position]),
+                'question_text': self.question_texts[row],
+                'choice_text': self.choice_texts[position]
+            }
+            for row, position in zip(rows.tolist(), positions.tolist())
+        }
+
+    def score_submission(self, data):
+        """(answers payload, PersonalityProfile) for a POSTed submission"""
+        answers = self.score(data)
+        return answers, score_answers(answers)
+
+
+def compile_assessment(assessment_id):
+    """Build the compiled form from the database; None for missing or inactive assessments"""
+    assessment = Assessment.objects.filter(id=assessment_id, is_active=True).first()
+    if assessment is None:
+        return None
+    questions = list(assessment.questions.all().prefetch_related('choices'))
+    return CompiledAssessment(assessment, questions)
+
@@ -0,0 +1,47 @@
+"""Cache of compiled assessment definitions.
+
+Compiled definitions are stored in the default cache under the assessment's
+generation token. Saving or deleting an Assessment, Question or Choice rotates
+the token (see assessments.signals), so rendering and scoring never traverse
+the ORM while the definition is unchanged. A token evicted from the cache is
+replaced by a fresh one, never a fixed default, so eviction can't bring back
+a definition compiled before an edit.
+"""
+import uuid
+
+from django.core.cache import cache
+
+KEY_PREFIX = 'assessments'
+
+
+def generation_key(assessment_id):
+    return f'{KEY_PREFIX}:generation:{assessment_id}'
+
+
+def compiled_key(assessment_id, generation):
+    return f'{KEY_PREFIX}:compiled:{assessment_id}:{generation}'
+
+
+def get_compiled_assessment(assessment_id):
+    """Compiled assessment for the current definition, compiling on a cache miss"""
+    generation = cache.get(generation_key(assessment_id))
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(generation_key(assessment_id), generation, None):
+            # Another request minted one first
+            generation = cache.get(generation_key(assessment_id), generation)
+    key = compiled_key(assessment_id, generation)
+
+    compiled = cache.get(key)
+    if compiled is None:
+        from .compiled import compile_assessment
+
+        compiled = compile_assessment(assessment_id)
+        if compiled is not None:
+            cache.set(key, compiled, None)
+    return compiled
+
+
+def invalidate_compiled_assessment(assessment_id):
+    """Make the cached definition unreachable so the next request recompiles"""
+    cache.set(generation_key(assessment_id), uuid.uuid4().hex, None)
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import TextField
+from django.db.models.functions import Cast
+
+from assessments.models import AssessmentResult, Choice
+from assessments.scoring import rescore_rows
+from recommendations.jobs import enqueue_refreshes
+
+
+def weights_fingerprint(choice_weights):
+    payload = json.dumps(sorted(choice_weights.items()))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def read_checkpoint(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path, checkpoint):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    with os.fdopen(fd, 'w') as tmp:
+        json.dump(checkpoint, tmp)
+    os.replace(tmp_path, path)
+
+
+class Command(BaseCommand):
+    help = 'Recompute personality_type and dominant_traits of stored results with the current choice weights'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Results streamed, scored and written per batch (default: 1000)'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Scoring processes; 1 scores in this process (default: CPU count)'
+        )
+        parser.add_argument(
+            '--assessment', type=int, default=None,
+            help='Only rescore results of this assessment id'
+        )
+        parser.add_argument(
+            '--checkpoint', default=None,
+            help='JSON file recording the last written result id; an existing file resumes the run'
+        )
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Ignore an existing checkpoint and start from the first result'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        workers = max(1, options['workers'])
+        checkpoint_path = options['checkpoint']
+
+        choice_weights = dict(Choice.objects.values_list('id', 'weight'))
+        fingerprint = weights_fingerprint(choice_weights)
+
+        checkpoint = {
+            'last_id': 0, 'processed': 0, 'updated': 0,
+            'weights': fingerprint, 'assessment': options['assessment'],
+        }
+        if checkpoint_path and not options['reset']:
+            saved = read_checkpoint(checkpoint_path)
+            if saved is not None:
+                if saved.get('weights') != fingerprint:
+                    raise CommandError(
+                        'Choice weights changed since the checkpoint was written; rerun with --reset'
+                    )
+                if saved.get('assessment') != options['assessment']:
+                    raise CommandError('The checkpoint was written for a different --assessment')
+                checkpoint = saved
+                self.stdout.write(f"Resuming after result {checkpoint['last_id']}")
+
+        results = AssessmentResult.objects.filter(id__gt=checkpoint['last_id']).order_by('id')
+        if options['assessment'] is not None:
+            results = results.filter(assessment_id=options['assessment'])
+        # JSON columns are streamed as text and decoded by the scoring workers
+        rows = results.values_list(
+            'id', Cast('score', TextField()), 'personality_type', Cast('dominant_traits', TextField())
+        ).iterator(chunk_size=batch_size)
+
+        started = time.perf_counter()
+        processed = updated = refreshes = 0
+
+        def write(batch, changes):
+            nonlocal processed, updated, refreshes
+            AssessmentResult.objects.bulk_update([
+                AssessmentResult(id=result_id, personality_type=personality_type,
+                                 dominant_traits=dominant_traits)
+                for result_id, personality_type, dominant_traits in changes
+            ], ['personality_type', 'dominant_traits'])
+
+            # bulk_update() sends no post_save, so queue the refreshes a save would have:
+            # recommendations are ranked by type, so only users whose type changed need one
+            old_types = {row[0]: row[2] for row in batch}
+            retyped = [result_id for result_id, personality_type, _ in changes
+                       if personality_type != old_types[result_id]]
+            if retyped:
+                refreshes += enqueue_refreshes(list(
+                    AssessmentResult.objects.filter(id__in=retyped).values_list('user_id', flat=True).distinct()
+                ))
+
+            processed += len(batch)
+            updated += len(changes)
+            checkpoint.update(
+                last_id=batch[-1][0],
+                processed=checkpoint['processed'] + len(batch),
+                updated=checkpoint['updated'] + len(changes),
+            )
+            if checkpoint_path:
+                write_checkpoint(checkpoint_path, checkpoint)
+
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{processed} results rescored, {updated} updated ({processed / elapsed:,.0f} results/s)'
+            )
+
+        if workers == 1:
+            for batch in self.batches(rows, batch_size):
+                write(batch, rescore_rows(batch, choice_weights))
+        else:
+            # Batches are written in stream order so the checkpoint only ever moves forward;
+            # at most two batches per worker are in flight to bound memory. Workers are
+            # spawned, not forked, so they never inherit the open database connection.
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                pending = deque()
+                for batch in self.batches(rows, batch_size):
+                    pending.append((batch, pool.submit(rescore_rows, batch, choice_weights)))
+                    if len(pending) >= 2 * workers:
+                        batch, future = pending.popleft()
+                        write(batch, future.result())
+                while pending:
+                    batch, future = pending.popleft()
+                    write(batch, future.result())
+
+        elapsed = time.perf_counter() - started
+        rate = processed / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescored {processed} results in {elapsed:.1f} s ({rate:,.0f} results/s), {updated} updated, '
+            f'{refreshes} recommendation refreshes queued'
+        ))
+
+    def batches(self, rows, batch_size):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentresult',
+            index=models.Index(fields=['user', '-completed_at'], name='result_user_completed_idx'),
+        ),
+    ]
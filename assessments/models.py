@@ -60,6 +60,10 @@ class AssessmentResult(models.Model):
 
     class Meta:
         unique_together = ["user", "assessment"]
+        indexes = [
+            # Latest personality type per user
+            models.Index(fields=["user", "-completed_at"], name="result_user_completed_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.assessment.title}"
@@ -0,0 +1,123 @@
+"""Single-pass MBTI scoring for assessment answers.
+
+Answer values are mapped to indices into a fixed trait array, weights are
+accumulated with one bincount, and the personality type, per-dimension
+strengths and dominant traits are all read off the same accumulators.
+``score_batch`` scores any number of stored ``AssessmentResult.score``
+payloads in one vectorized pass, and ``rescore_rows`` wraps it for the bulk
+rescoring command's worker processes.
+"""
+import json
+from collections import namedtuple
+from operator import itemgetter
+
+import numpy as np
+
+DIMENSIONS = ('EI', 'SN', 'TF', 'JP')
+TRAITS = ''.join(DIMENSIONS)
+TRAIT_INDEX = {trait: index for index, trait in enumerate(TRAITS)}
+DOMINANT_TRAITS = 5
+
+PersonalityProfile = namedtuple('PersonalityProfile', ['personality_type', 'strengths', 'dominant_traits'])
+
+
+def personality_types(trait_totals):
+    """MBTI letters per row of trait totals; ties go to the second letter"""
+    first = trait_totals[:, 0::2] > trait_totals[:, 1::2]
+    letters = np.where(first, np.array(list(TRAITS[0::2])), np.array(list(TRAITS[1::2])))
+    return [''.join(row) for row in letters.tolist()]
+
+
+def dimension_strengths(trait_totals):
+    """Confidence margin per row and dimension: |a - b| / (a + b), 0 when unanswered"""
+    totals = trait_totals[:, 0::2] + trait_totals[:, 1::2]
+    margins = np.divide(np.abs(trait_totals[:, 0::2] - trait_totals[:, 1::2]), totals,
+                        out=np.zeros_like(totals), where=totals > 0)
+    return [dict(zip(DIMENSIONS, row)) for row in np.round(margins, 4).tolist()]
+
+
+def dominant_traits(counts, first_seen, vocab):
+    """Top DOMINANT_TRAITS values per row by answer count, ties in answer order"""
+    cells = np.flatnonzero(counts)
+    rows, codes = np.divmod(cells, counts.shape[1])
+    order = np.lexsort((first_seen.ravel()[cells], -counts.ravel()[cells], rows))
+    rows, codes = rows[order], codes[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    keep = rank < DOMINANT_TRAITS
+
+    traits = [[] for _ in range(counts.shape[0])]
+    for row, code, count in zip(rows[keep].tolist(), codes[keep].tolist(),
+                                counts[rows[keep], codes[keep]].tolist()):
+        traits[row].append({'trait': vocab[code], 'count': count})
+    return traits
+
+
+def score_batch(payloads, choice_weights=None):
+    """Score answer payloads together; returns one PersonalityProfile per payload.
+
+    `choice_weights` maps choice ids to current weights, overriding the weight
+    recorded in the payload, so stored results can be rescored after an edit.
+    """
+    lengths, values, weights = [], [], []
+    for answers in payloads:
+        answers = list(answers.values())
+        lengths.append(len(answers))
+        values.extend(map(itemgetter('value'), answers))
+        if choice_weights is None:
+            weights.extend(map(itemgetter('weight'), answers))
+        else:
+            weights.extend(choice_weights.get(answer.get('choice_id'), answer['weight']) for answer in answers)
+
+    payload_count = len(lengths)
+    if not payload_count:
+        return []
+
+    # Value codes in first-seen order
+    vocab = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    vocab_size = len(vocab)
+    rows = np.repeat(np.arange(payload_count), lengths)
+    codes = np.fromiter(map(vocab.__getitem__, values), dtype=np.int64, count=len(values))
+    weights = np.array(weights, dtype=np.float64)
+
+    # Weight per (payload, trait); answers outside the four dimensions only count as traits
+    traits = np.array([TRAIT_INDEX.get(value, -1) for value in vocab], dtype=np.int64)[codes]
+    is_trait = traits >= 0
+    trait_totals = np.bincount(
+        rows[is_trait] * len(TRAITS) + traits[is_trait], weights=weights[is_trait],
+        minlength=payload_count * len(TRAITS)
+    ).reshape(payload_count, len(TRAITS))
+
+    # Answer count and first position per (payload, value) order the dominant traits
+    cells = rows * vocab_size + codes
+    counts = np.bincount(cells, minlength=payload_count * vocab_size).reshape(payload_count, vocab_size)
+    first_seen = np.full(payload_count * vocab_size, len(cells), dtype=np.int64)
+    np.minimum.at(first_seen, cells, np.arange(len(cells)))
+
+    return [
+        PersonalityProfile(*profile)
+        for profile in zip(
+            personality_types(trait_totals),
+            dimension_strengths(trait_totals),
+            dominant_traits(counts, first_seen.reshape(payload_count, vocab_size), list(vocab)),
+        )
+    ]
+
+
+def score_answers(answers, choice_weights=None):
+    """PersonalityProfile for a single answers payload"""
+    return score_batch([answers], choice_weights)[0]
+
+
+def rescore_rows(rows, choice_weights=None):
+    """Rescore (id, score, personality_type, dominant_traits) rows with JSON columns as text.
+
+    Decoding happens here so it runs in the worker, not the process streaming
+    rows; returns (id, personality_type, dominant_traits) for changed rows only.
+    """
+    profiles = score_batch([json.loads(row[1]) for row in rows], choice_weights)
+    return [
+        (result_id, profile.personality_type, profile.dominant_traits)
+        for (result_id, _, personality_type, dominant_traits), profile in zip(rows, profiles)
+        if profile.personality_type != personality_type
+        or profile.dominant_traits != json.loads(dominant_traits)
+    ]
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .definition_cache import invalidate_compiled_assessment
+from .models import Assessment, Choice, Question
+
+
+def assessment_changed(assessment_id):
+    # Rotate after commit so no request can recompile the old rows under the new token
+    if assessment_id is not None:
+        transaction.on_commit(lambda: invalidate_compiled_assessment(assessment_id))
+
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+def invalidate_assessment(sender, instance, **kwargs):
+    assessment_changed(instance.id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question(sender, instance, **kwargs):
+    assessment_changed(instance.assessment_id)
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def invalidate_choice(sender, instance, **kwargs):
+    # None when the question itself was deleted, which already invalidated
+    assessment_changed(
+        Question.objects.filter(id=instance.question_id)
+        .values_list("assessment_id", flat=True)
+        .first()
+    )
@@ -1,3 +1,268 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .compiled import compile_assessment
+from .definition_cache import generation_key
+from .models import Assessment, AssessmentResult, Choice, Question
+from .scoring import score_answers, score_batch
+from recommendations.models import RecommendationJob
+
+User = get_user_model()
+
+# Session, user, existing result, the four statements of the result upsert,
+# student profile and the job insert; the definition itself comes from the cache
+QUERIES_PER_SUBMISSION = 9
+
+
+def build_assessment(question_count):
+    assessment = Assessment.objects.create(
+        title=f'MBTI {question_count}', description='Personality',
+        assessment_type='personality', time_required=10, questions_count=question_count
+    )
+    questions = Question.objects.bulk_create([
+        Question(assessment=assessment, text=f'Question {order}', order=order)
+        for order in range(question_count)
+    ])
+    pairs = ('EI', 'SN', 'TF', 'JP')
+    Choice.objects.bulk_create([
+        Choice(question=question, text=value, value=value, weight=1.0)
+        for question in questions
+        for value in pairs[question.order % 4]
+    ])
+    return assessment
+
+
+class TakeAssessmentQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.client.force_login(self.user)
+
+    def submission(self, assessment, pick=0):
+        return {
+            f'question_{question.id}': str(question.choices.all()[pick].id)
+            for question in assessment.questions.prefetch_related('choices')
+        }
+
+    def submit(self, question_count):
+        assessment = build_assessment(question_count)
+        data = self.submission(assessment)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('take_assessment', args=[assessment.id]), data)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_questions(self):
+        self.assertEqual(self.submit(10), self.submit(100))
+
+    def test_hundred_question_submission_query_count(self):
+        assessment = build_assessment(100)
+        data = self.submission(assessment)
+        self.client.post(reverse('take_assessment', args=[assessment.id]), data)
+        with self.assertNumQueries(QUERIES_PER_SUBMISSION):
+            self.client.post(reverse('take_assessment', args=[assessment.id]), data)
+
+    def test_choices_from_other_questions_are_ignored(self):
+        assessment = build_assessment(4)
+        questions = list(assessment.questions.prefetch_related('choices'))
+        data = self.submission(assessment)
+        # Answer question 0 with a choice that belongs to question 1
+        data[f'question_{questions[0].id}'] = str(questions[1].choices.all()[0].id)
+        self.client.post(reverse('take_assessment', args=[assessment.id]), data)
+
+        result = AssessmentResult.objects.get(user=self.user, assessment=assessment)
+        self.assertNotIn(str(questions[0].id), result.score)
+        self.assertEqual(len(result.score), 3)
+
+
+class CompiledAssessmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.client.force_login(self.user)
+        self.assessment = build_assessment(8)
+        self.url = reverse('take_assessment', args=[self.assessment.id])
+
+    def test_take_page_renders_from_cache(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Question 7')
+        self.assertFalse([query for query in queries if 'assessments_question' in query['sql']])
+
+    def test_saving_a_question_recompiles(self):
+        self.client.get(self.url)
+        question = self.assessment.questions.get(order=3)
+        question.text = 'Do you enjoy large gatherings?'
+        with self.captureOnCommitCallbacks(execute=True):
+            question.save()
+        self.assertContains(self.client.get(self.url), 'Do you enjoy large gatherings?')
+
+    def test_evicted_generation_does_not_restore_old_definition(self):
+        self.client.get(self.url)
+        question = self.assessment.questions.get(order=3)
+        question.text = 'Do you enjoy large gatherings?'
+        with self.captureOnCommitCallbacks(execute=True):
+            question.save()
+        self.assertContains(self.client.get(self.url), 'Do you enjoy large gatherings?')
+
+        cache.delete(generation_key(self.assessment.id))
+        self.assertContains(self.client.get(self.url), 'Do you enjoy large gatherings?')
+
+    def test_deactivated_assessment_is_not_found(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assessment.is_active = False
+            self.assessment.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_score_ignores_malformed_answers(self):
+        compiled = compile_assessment(self.assessment.id)
+        question = compiled.questions[0]
+        answers = compiled.score({
+            f"question_{question['id']}": str(question['choices'][1]['id']),
+            f"question_{compiled.questions[1]['id']}": 'not-a-choice',
+            f"question_{compiled.questions[2]['id']}": '999999',
+        })
+        self.assertEqual(list(answers), [str(question['id'])])
+        self.assertEqual(answers[str(question['id'])]['value'], 'I')
+
+    def test_non_ascii_and_oversized_answers_are_dropped(self):
+        compiled = compile_assessment(self.assessment.id)
+        questions = compiled.questions
+        # A real choice id in Arabic-Indic digits, which int() would accept
+        arabic_id = str(questions[1]['choices'][0]['id']).translate(str.maketrans('0123456789', '٠١٢٣٤٥٦٧٨٩'))
+        response = self.client.post(self.url, {
+            f"question_{questions[0]['id']}": str(questions[0]['choices'][0]['id']),
+            f"question_{questions[1]['id']}": arabic_id,
+            f"question_{questions[2]['id']}": '²',
+            f"question_{questions[3]['id']}": '9' * 20,
+        })
+        self.assertEqual(response.status_code, 200)
+
+        result = AssessmentResult.objects.get(user=self.user, assessment=self.assessment)
+        self.assertEqual(list(result.score), [str(questions[0]['id'])])
+
+
+class PersonalityScoringTests(SimpleTestCase):
+    def test_batch_matches_original_scoring(self):
+        from benchmarks.assessment_scoring import (
+            calculate_personality_type, get_dominant_traits, synthetic_payloads
+        )
+
+        payloads = synthetic_payloads(300, questions=24) + [{}]
+        for answers, profile in zip(payloads, score_batch(payloads)):
+            self.assertEqual(profile.personality_type, calculate_personality_type(answers))
+            self.assertEqual(profile.dominant_traits, get_dominant_traits(answers))
+
+    def test_strengths_are_confidence_margins(self):
+        answers = {
+            '1': {'choice_id': 1, 'value': 'E', 'weight': 3.0},
+            '2': {'choice_id': 2, 'value': 'I', 'weight': 1.0},
+            '3': {'choice_id': 3, 'value': 'N', 'weight': 2.0},
+        }
+        profile = score_answers(answers)
+        self.assertEqual(profile.personality_type, 'ENFP')
+        self.assertEqual(profile.strengths, {'EI': 0.5, 'SN': 1.0, 'TF': 0.0, 'JP': 0.0})
+
+    def test_choice_weights_override_stored_weights(self):
+        answers = {
+            '1': {'choice_id': 1, 'value': 'E', 'weight': 2.0},
+            '2': {'choice_id': 2, 'value': 'I', 'weight': 1.0},
+        }
+        self.assertEqual(score_answers(answers).personality_type[0], 'E')
+        self.assertEqual(score_answers(answers, choice_weights={2: 5.0}).personality_type[0], 'I')
+
+    def test_empty_batch(self):
+        self.assertEqual(score_batch([]), [])
+
+
+class RescoreAssessmentResultsTests(TestCase):
+    def setUp(self):
+        self.assessment = build_assessment(8)
+        self.choices = list(Choice.objects.filter(question__assessment=self.assessment).order_by('id'))
+        self.results = []
+        for index in range(5):
+            user = User.objects.create_user(username=f'student{index}', password='secret')
+            # The first choice of each question: E, S, T, J twice each
+            answers = {
+                str(choice.question_id): {
+                    'choice_id': choice.id, 'value': choice.value, 'weight': choice.weight,
+                    'question_text': '', 'choice_text': choice.text
+                }
+                for choice in self.choices[0::2]
+            }
+            # Every other user answers I on question 0, tying E/I
+            if index % 2:
+                flipped = self.choices[1]
+                answers[str(flipped.question_id)].update(
+                    choice_id=flipped.id, value=flipped.value, weight=flipped.weight
+                )
+            profile = score_answers(answers)
+            self.results.append(AssessmentResult.objects.create(
+                user=user, assessment=self.assessment, score=answers,
+                personality_type=profile.personality_type, dominant_traits=profile.dominant_traits
+            ))
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.checkpoint_dir, ignore_errors=True)
+        self.checkpoint = os.path.join(self.checkpoint_dir, 'rescore.json')
+
+    def rescore(self, **options):
+        options.setdefault('workers', 1)
+        stdout = io.StringIO()
+        call_command('rescore_assessment_results', stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def test_rescores_with_current_weights(self):
+        self.assertIn('0 updated', self.rescore())
+
+        # Users who tied E/I on the two EI questions now lean E
+        Choice.objects.filter(id=self.choices[8].id).update(weight=2.0)
+        output = self.rescore(batch_size=2)
+        self.assertIn('Rescored 5 results', output)
+        self.assertIn('2 updated', output)
+        types = dict(AssessmentResult.objects.values_list('id', 'personality_type'))
+        self.assertEqual([types[result.id][0] for result in self.results], ['E'] * 5)
+        # Only the users whose type changed get their recommendations refreshed
+        self.assertIn('2 recommendation refreshes queued', output)
+        self.assertEqual(
+            set(RecommendationJob.objects.values_list('user_id', flat=True)),
+            {self.results[1].user_id, self.results[3].user_id},
+        )
+
+    def test_resumes_from_checkpoint(self):
+        self.rescore(batch_size=2, checkpoint=self.checkpoint)
+        with open(self.checkpoint) as fh:
+            saved = json.load(fh)
+        self.assertEqual(saved['last_id'], self.results[-1].id)
+        self.assertEqual(saved['processed'], 5)
+
+        saved.update(last_id=self.results[2].id, processed=3)
+        with open(self.checkpoint, 'w') as fh:
+            json.dump(saved, fh)
+        output = self.rescore(checkpoint=self.checkpoint)
+        self.assertIn(f'Resuming after result {self.results[2].id}', output)
+        self.assertIn('Rescored 2 results', output)
+
+    def test_checkpoint_from_other_weights_is_rejected(self):
+        self.rescore(checkpoint=self.checkpoint)
+        Choice.objects.filter(id=self.choices[8].id).update(weight=2.0)
+        with self.assertRaises(CommandError):
+            self.rescore(checkpoint=self.checkpoint)
+        self.assertIn('2 updated', self.rescore(checkpoint=self.checkpoint, reset=True))
+
+    def test_process_pool_matches_in_process_scoring(self):
+        Choice.objects.filter(id=self.choices[8].id).update(weight=2.0)
+        output = self.rescore(workers=2, batch_size=2)
+        self.assertIn('2 updated', output)
@@ -4,4 +4,5 @@ from . import views
 urlpatterns = [
     path("", views.assessment_list, name="assessment_list"),
     path("<int:assessment_id>/", views.take_assessment, name="take_assessment"),
+    path("results/<int:result_id>/", views.assessment_results, name="assessment_results"),
 ]
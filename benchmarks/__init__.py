@@ -0,0 +1,4 @@
+"""Performance benchmarks for the career guidance hot paths.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.personality``.
+"""
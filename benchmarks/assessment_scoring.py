@@ -0,0 +1,104 @@
+"""Microbenchmark: the original two-walk MBTI scoring vs the batch scorer.
+
+Run with ``python -m benchmarks.assessment_scoring``.
+"""
+import argparse
+import random
+import timeit
+
+from assessments.scoring import TRAITS, score_batch
+
+
+def calculate_personality_type(answers):
+    """The original implementation: nested dicts and string comparisons"""
+    dimensions = {
+        'EI': {'E': 0, 'I': 0},
+        'SN': {'S': 0, 'N': 0},
+        'TF': {'T': 0, 'F': 0},
+        'JP': {'J': 0, 'P': 0},
+    }
+
+    for answer_data in answers.values():
+        value = answer_data['value']
+        weight = answer_data['weight']
+
+        if value in ['E', 'I']:
+            dimensions['EI'][value] += weight
+        elif value in ['S', 'N']:
+            dimensions['SN'][value] += weight
+        elif value in ['T', 'F']:
+            dimensions['TF'][value] += weight
+        elif value in ['J', 'P']:
+            dimensions['JP'][value] += weight
+
+    personality = ''
+    personality += 'E' if dimensions['EI']['E'] > dimensions['EI']['I'] else 'I'
+    personality += 'S' if dimensions['SN']['S'] > dimensions['SN']['N'] else 'N'
+    personality += 'T' if dimensions['TF']['T'] > dimensions['TF']['F'] else 'F'
+    personality += 'J' if dimensions['JP']['J'] > dimensions['JP']['P'] else 'P'
+
+    return personality
+
+
+def get_dominant_traits(answers):
+    """The original implementation: a second walk counting values"""
+    trait_count = {}
+    for answer_data in answers.values():
+        value = answer_data['value']
+        trait_count[value] = trait_count.get(value, 0) + 1
+
+    return [{'trait': trait, 'count': count} for trait, count in sorted(
+        trait_count.items(), key=lambda x: x[1], reverse=True
+    )[:5]]
+
+
+def synthetic_payloads(count, questions=60, seed=0):
+    rng = random.Random(seed)
+    values = list(TRAITS) + ['creative', 'analytical']
+    return [
+        {
+            str(question): {
+                'choice_id': question * 10 + rng.randrange(4),
+                'value': rng.choice(values),
+                'weight': rng.choice([0.5, 1.0, 1.5, 2.0]),
+            }
+            for question in range(questions)
+        }
+        for _ in range(count)
+    ]
+
+
+def run(payload_count, questions):
+    payloads = synthetic_payloads(payload_count, questions)
+
+    for answers, profile in zip(payloads, score_batch(payloads)):
+        assert profile.personality_type == calculate_personality_type(answers)
+        assert profile.dominant_traits == get_dominant_traits(answers)
+
+    def original():
+        for answers in payloads:
+            calculate_personality_type(answers)
+            get_dominant_traits(answers)
+
+    def batch():
+        score_batch(payloads)
+
+    original_time = min(timeit.repeat(original, number=1, repeat=5))
+    batch_time = min(timeit.repeat(batch, number=1, repeat=5))
+
+    print(f"payloads:        {payload_count} x {questions} answers")
+    print(f"original walks:  {original_time * 1e3:8.1f} ms")
+    print(f"batch scorer:    {batch_time * 1e3:8.1f} ms")
+    print(f"speedup:         {original_time / batch_time:8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--payloads', type=int, default=10000, help='Stored results to rescore')
+    parser.add_argument('--questions', type=int, default=60, help='Answers per result')
+    args = parser.parse_args()
+    run(args.payloads, args.questions)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark: every recommendation engine backend on the same inputs.
+
+Builds each registered backend over one synthetic catalog and scores one set
+of synthetic users with it, reporting:
+
+  build    first recommendation, including any arrays the backend precomputes
+  p50/p95  per-user generate_career_recommendations latency
+  batch    generate_batch_recommendations throughput
+  peak     largest traced allocation while building and scoring
+
+Every backend must rank each user exactly like the first one measured.
+
+Run with ``python -m benchmarks.engines``.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from recommendations.engines import backend_names, build_engine
+
+SKILLS = ['Python', 'SQL', 'Machine Learning', 'Java', 'Figma', 'R', 'SEO', 'Data Analysis',
+          'Testing', 'Cloud Computing', 'User Research', 'Statistics', 'Marketing Automation']
+TYPES = ['INTJ', 'INTP', 'ENTJ', 'ENTP', 'INFJ', 'INFP', 'ENFJ', 'ENFP',
+         'ISTJ', 'ISFJ', 'ESTJ', 'ESFJ', 'ISTP', 'ISFP', 'ESTP', 'ESFP']
+CATEGORIES = ['Technology', 'Design', 'Marketing', 'Business', 'Healthcare', 'Law']
+EDUCATION = ['high_school', 'undergraduate', 'graduate', 'phd', 'working']
+
+
+def synthetic_catalog(count, rng):
+    return [
+        {
+            'id': i,
+            'title': f'Career {i}',
+            'category': rng.choice(CATEGORIES),
+            'skills': rng.sample(SKILLS, rng.randint(3, 8)),
+            'personality_traits': rng.sample(TYPES, rng.randint(1, 5)),
+            'education_required': rng.choice(["Bachelor's degree", "Master's degree", 'None']),
+            'experience_level': 'Entry',
+            'salary_range': {'min': 40000, 'max': 90000, 'median': 60000},
+            'job_growth': rng.randint(0, 40),
+            'demand_score': rng.randint(50, 100),
+            'remote_friendly': rng.random() < 0.5,
+            'stress_level': 'Medium',
+            'description': f'Description of career {i}',
+            'day_to_day': [],
+            'companies': [],
+        }
+        for i in range(count)
+    ]
+
+
+def synthetic_users(count, rng):
+    return [
+        {
+            'personality_type': rng.choice(TYPES),
+            'skills': ', '.join(rng.sample(SKILLS, rng.randint(0, 5))),
+            'education_level': rng.choice(EDUCATION),
+            'preferences': {'remote_work': round(rng.random(), 2)},
+        }
+        for _ in range(count)
+    ]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def build(backend, careers, user_data, top_n):
+    engine = build_engine(backend)
+    engine.set_career_database(careers)
+    engine.generate_career_recommendations(user_data, top_n)
+    return engine
+
+
+def measure(backend, careers, users, top_n):
+    # The first engine built pays for importing NumPy and scikit-learn; keep that out of build
+    build_engine(backend)
+
+    started = time.perf_counter()
+    engine = build(backend, careers, users[0], top_n)
+    build_elapsed = time.perf_counter() - started
+
+    rankings, latencies = [], []
+    for user_data in users:
+        started = time.perf_counter()
+        recommendations = engine.generate_career_recommendations(user_data, top_n)
+        latencies.append(time.perf_counter() - started)
+        rankings.append([rec['career'] for rec in recommendations])
+
+    started = time.perf_counter()
+    batch = list(engine.generate_batch_recommendations(users, top_n))
+    batch_elapsed = time.perf_counter() - started
+    assert [[rec['career'] for rec in recs] for recs in batch] == rankings
+
+    # Traced separately: tracemalloc slows allocation-heavy code down too much to time it
+    del engine, batch
+    tracemalloc.start()
+    engine = build(backend, careers, users[0], top_n)
+    list(engine.generate_batch_recommendations(users, top_n))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'build': build_elapsed,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'batch_rate': len(users) / batch_elapsed,
+        'peak': peak,
+        'rankings': rankings,
+    }
+
+
+def run(backends, careers, users, top_n, seed):
+    rng = random.Random(seed)
+    catalog = synthetic_catalog(careers, rng)
+    profiles = synthetic_users(users, rng)
+
+    print(f"{careers} careers, {users} users, top {top_n}\n")
+    print(f"{'backend':<10} {'build':>10} {'p50':>10} {'p95':>10} {'batch':>14} {'peak':>10}")
+    reference = None
+    for backend in backends:
+        result = measure(backend, catalog, profiles, top_n)
+        print(
+            f"{backend:<10} {result['build'] * 1000:8.1f}ms {result['p50'] * 1000:8.2f}ms "
+            f"{result['p95'] * 1000:8.2f}ms {result['batch_rate']:9,.0f} usr/s "
+            f"{result['peak'] / 1e6:8.1f}MB"
+        )
+        if reference is None:
+            reference = result['rankings']
+        elif result['rankings'] != reference:
+            raise SystemExit(f"{backend} ranks users differently from {backends[0]}")
+    print(f"\nall {len(backends)} backends agree on every ranking")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', action='append', choices=backend_names(),
+                        help='Backend to measure; repeat for several (default: all registered)')
+    parser.add_argument('--careers', type=int, default=2000, help='Synthetic catalog size')
+    parser.add_argument('--users', type=int, default=200, help='Synthetic users scored per backend')
+    parser.add_argument('--top-n', type=int, default=10, help='Recommendations per user')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic inputs')
+    args = parser.parse_args()
+    run(args.backend or backend_names(), args.careers, args.users, args.top_n, args.seed)
+
+
+if __name__ == '__main__':
+    main()
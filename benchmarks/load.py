@@ -0,0 +1,253 @@
+"""Load test: requests/sec for assessment submission and the recommendation dashboard.
+
+Creates a throwaway test database on the configured DATABASE_URL (a file for
+SQLite), seeds it with students, an assessment and their materialized
+recommendations, then drives ``core.wsgi.application`` from a pool of
+threads, each one thread of a threaded WSGI server (gunicorn gthread): every
+request runs the full middleware stack, and the request_finished signal
+closes connections older than CONN_MAX_AGE, as in production.
+
+Each CONN_MAX_AGE given is a separate run, reporting per view:
+
+  rps      requests per second across all threads
+  p50/p95  request latency
+  conns    database connections opened
+  errors   requests that failed, e.g. "database is locked" on SQLite
+
+Run with ``python -m benchmarks.load``; set DATABASE_URL to load test a local
+PostgreSQL.
+"""
+import argparse
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.engines import percentile
+
+SKILLS = ['Python', 'SQL', 'Machine Learning', 'Figma', 'Statistics', 'Data Analysis', 'Testing']
+
+
+class ConnectionCounter:
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, sender, connection, **kwargs):
+        with self.lock:
+            self.count += 1
+
+
+def create_database(workdir):
+    """Create and migrate the test database; returns the name to pass to destroy_database()"""
+    from django.db import connection
+
+    if connection.vendor == 'sqlite':
+        # A file rather than Django's shared in-memory test database, like a deployment
+        connection.settings_dict['TEST']['NAME'] = os.path.join(workdir, 'load.sqlite3')
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    return old_name
+
+
+def destroy_database(old_name):
+    from django.db import connection
+
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def build_assessment(question_count):
+    from assessments.models import Assessment, Choice, Question
+
+    assessment = Assessment.objects.create(
+        title='Load test', description='Personality', assessment_type='personality',
+        time_required=10, questions_count=question_count
+    )
+    questions = Question.objects.bulk_create([
+        Question(assessment=assessment, text=f'Question {order}', order=order)
+        for order in range(question_count)
+    ])
+    pairs = ('EI', 'SN', 'TF', 'JP')
+    Choice.objects.bulk_create([
+        Choice(question=question, text=value, value=value, weight=1.0)
+        for question in questions
+        for value in pairs[question.order % 4]
+    ])
+    return assessment
+
+
+def seed(users, questions):
+    """Students with a profile and materialized recommendations, and one assessment"""
+    import random
+
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    from recommendations.materialize import refresh_user_recommendations
+    from users.models import StudentProfile
+
+    User = get_user_model()
+    rng = random.Random(0)
+    call_command('load_career_catalog', stdout=io.StringIO())
+    students = User.objects.bulk_create([User(username=f'load{i}') for i in range(users)])
+    StudentProfile.objects.bulk_create([
+        StudentProfile(
+            user=student, education_level='undergraduate',
+            skills=', '.join(rng.sample(SKILLS, rng.randint(1, 4)))
+        )
+        for student in students
+    ])
+    for student in students:
+        refresh_user_recommendations(student)
+    return students, build_assessment(questions)
+
+
+def signed_in_factory(user):
+    """RequestFactory carrying the user's session and CSRF cookies"""
+    from django.conf import settings
+    from django.test import Client, RequestFactory
+    from django.utils.crypto import get_random_string
+
+    client = Client()
+    client.force_login(user)
+    csrf_token = get_random_string(32)
+    factory = RequestFactory(HTTP_HOST='localhost', HTTP_X_CSRFTOKEN=csrf_token)
+    factory.cookies = client.cookies
+    factory.cookies[settings.CSRF_COOKIE_NAME] = csrf_token
+    return factory
+
+
+def submission(assessment, rng):
+    return {
+        f'question_{question.id}': str(rng.choice(question.choices.all()).id)
+        for question in assessment.questions.prefetch_related('choices')
+    }
+
+
+def call(application, environ):
+    """Serve one request; True when it succeeded"""
+    statuses = []
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in response:
+            pass
+    finally:
+        # Sends request_finished, which closes connections older than CONN_MAX_AGE
+        response.close()
+    return statuses[0].startswith('200')
+
+
+def drive(application, environs, threads):
+    """Run every request on a pool of `threads` threads; returns (elapsed, sorted latencies, errors)"""
+    from django.db import connections
+
+    latencies, errors = [], []
+    chunks = [environs[i::threads] for i in range(threads)]
+
+    def worker(chunk):
+        try:
+            for environ in chunk:
+                started = time.perf_counter()
+                if call(application, environ):
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors.append(environ)
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for future in [pool.submit(worker, chunk) for chunk in chunks]:
+            future.result()
+    elapsed = time.perf_counter() - started
+    return elapsed, sorted(latencies), len(errors)
+
+
+def scenarios(factories, assessment, requests):
+    """(view, environs) pairs; every environ is fresh since WSGI consumes its input"""
+    import random
+
+    from django.urls import reverse
+
+    rng = random.Random(0)
+    submit_url = reverse('take_assessment', args=[assessment.id])
+    dashboard_url = reverse('recommendations:recommendation_dashboard')
+    payloads = [submission(assessment, rng) for _ in range(len(factories))]
+    return [
+        ('submit', [
+            factories[i % len(factories)].post(submit_url, payloads[i % len(factories)]).environ
+            for i in range(requests)
+        ]),
+        ('dashboard', [
+            factories[i % len(factories)].get(dashboard_url).environ for i in range(requests)
+        ]),
+    ]
+
+
+def run(workdir, conn_max_ages, users, questions, requests, threads):
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection, connections
+    from django.db.backends.signals import connection_created
+
+    old_name = create_database(workdir)
+    try:
+        students, assessment = seed(users, questions)
+        factories = [signed_in_factory(student) for student in students]
+        application = get_wsgi_application()
+        # Failed requests are counted; their tracebacks would drown the report
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        connections.close_all()
+
+        print(f"{connection.vendor} ({connection.settings_dict['NAME']}), {users} users, "
+              f"{requests} requests per view, {threads} threads\n")
+        print(f"{'max age':>8} {'view':<10} {'rps':>9} {'p50':>10} {'p95':>10} {'conns':>7} {'errors':>7}")
+        counter = ConnectionCounter()
+        connection_created.connect(counter)
+        for conn_max_age in conn_max_ages:
+            connections.settings[connection.alias]['CONN_MAX_AGE'] = conn_max_age
+            for view, environs in scenarios(factories, assessment, requests):
+                # Warm the caches and compiled assessment so only steady state is measured
+                drive(application, environs[:threads], threads)
+                counter.count = 0
+                elapsed, latencies, errors = drive(application, environs[threads:], threads)
+                print(
+                    f"{conn_max_age:>7}s {view:<10} {len(latencies) / elapsed:9.1f} "
+                    f"{percentile(latencies, 0.50) * 1000:8.2f}ms "
+                    f"{percentile(latencies, 0.95) * 1000:8.2f}ms {counter.count:>7} {errors:>7}"
+                )
+        connection_created.disconnect(counter)
+    finally:
+        destroy_database(old_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--conn-max-age', type=int, action='append',
+                        help='CONN_MAX_AGE to run with; repeat for several (default: 0 and the setting)')
+    parser.add_argument('--users', type=int, default=20, help='Signed-in students sending requests')
+    parser.add_argument('--questions', type=int, default=40, help='Questions in the submitted assessment')
+    parser.add_argument('--requests', type=int, default=400, help='Requests per view and run')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent request threads')
+    args = parser.parse_args()
+
+    # Keep the file cache and SQLite database of the run out of the project directory
+    workdir = tempfile.mkdtemp()
+    os.environ.setdefault('CACHE_LOCATION', os.path.join(workdir, 'cache'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    from django.conf import settings
+    django.setup()
+
+    try:
+        conn_max_ages = args.conn_max_age or [0, settings.DATABASES['default']['CONN_MAX_AGE']]
+        run(workdir, conn_max_ages, args.users, args.questions, args.requests, args.threads)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Microbenchmark: per-call personality cosine vs the precomputed similarity table.
+
+Run with ``python -m benchmarks.personality``.
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from recommendations.ai_engine import AdvancedCareerAI
+
+
+def per_call_compatibility(personality_mapping, user_personality, career_traits):
+    """The original implementation: rebuild and normalise vectors on every call"""
+    if not user_personality or user_personality not in personality_mapping:
+        return 0.5
+
+    user_profile = personality_mapping[user_personality]
+    compatibilities = []
+    for trait in career_traits:
+        if trait in personality_mapping:
+            career_profile = personality_mapping[trait]
+            user_vec = np.array(list(user_profile.values()))
+            career_vec = np.array(list(career_profile.values()))
+            similarity = np.dot(user_vec, career_vec) / (np.linalg.norm(user_vec) * np.linalg.norm(career_vec))
+            compatibilities.append(similarity)
+
+    return np.mean(compatibilities) if compatibilities else 0.5
+
+
+def run(number):
+    engine = AdvancedCareerAI()
+    pairs = [
+        (ptype, career['personality_traits'])
+        for ptype in engine.personality_types
+        for career in engine.career_database
+    ]
+
+    for ptype, traits in pairs:
+        assert engine.calculate_personality_compatibility(ptype, traits) == \
+            per_call_compatibility(engine.personality_mapping, ptype, traits)
+
+    def per_call():
+        for ptype, traits in pairs:
+            per_call_compatibility(engine.personality_mapping, ptype, traits)
+
+    def lookup():
+        for ptype, traits in pairs:
+            engine.calculate_personality_compatibility(ptype, traits)
+
+    per_call_time = min(timeit.repeat(per_call, number=number, repeat=5)) / (number * len(pairs))
+    lookup_time = min(timeit.repeat(lookup, number=number, repeat=5)) / (number * len(pairs))
+
+    print(f"pairs per run:   {len(pairs)}")
+    print(f"per-call cosine: {per_call_time * 1e6:8.2f} us/call")
+    print(f"table lookup:    {lookup_time * 1e6:8.2f} us/call")
+    print(f"speedup:         {per_call_time / lookup_time:8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=200, help='Loops over all (type, career) pairs per repeat')
+    run(parser.parse_args().number)
+
+
+if __name__ == '__main__':
+    main()
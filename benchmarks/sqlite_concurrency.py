@@ -0,0 +1,100 @@
+"""Benchmark: concurrent assessment submissions on Django's SQLite backend vs core.sqlite.
+
+Seeds a fresh SQLite file per backend with benchmarks.load and submits
+assessments from a pool of threads through the full WSGI stack. Django's
+stock backend runs a rollback journal with deferred transactions, where
+concurrent writers fail with "database is locked"; core.sqlite adds WAL,
+the tuned pragmas and BEGIN IMMEDIATE.
+
+  rps      successful submissions per second across all threads
+  p50/p95  latency of successful submissions
+  errors   submissions that failed
+
+Run with ``python -m benchmarks.sqlite_concurrency``.
+"""
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+
+from benchmarks.engines import percentile
+from benchmarks.load import create_database, destroy_database, drive, scenarios, seed, signed_in_factory
+
+BACKENDS = [
+    ('stock', 'django.db.backends.sqlite3'),
+    ('tuned', 'core.sqlite'),
+]
+
+
+def use_backend(engine):
+    from django.db import DEFAULT_DB_ALIAS, connections
+
+    connections.close_all()
+    connections.settings[DEFAULT_DB_ALIAS]['ENGINE'] = engine
+    # Every thread builds its next connection with the new backend, this one included
+    try:
+        del connections[DEFAULT_DB_ALIAS]
+    except AttributeError:
+        pass
+
+
+def measure(workdir, engine, thread_counts, users, questions, requests):
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connections
+
+    use_backend(engine)
+    old_name = create_database(workdir)
+    try:
+        students, assessment = seed(users, questions)
+        factories = [signed_in_factory(student) for student in students]
+        application = get_wsgi_application()
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        connections.close_all()
+
+        results = []
+        for threads in thread_counts:
+            environs = dict(scenarios(factories, assessment, requests + threads))['submit']
+            # Warm the compiled assessment cache
+            drive(application, environs[:threads], threads)
+            elapsed, latencies, errors = drive(application, environs[threads:], threads)
+            results.append((threads, len(latencies) / elapsed, latencies, errors))
+        return results
+    finally:
+        destroy_database(old_name)
+
+
+def run(workdir, thread_counts, users, questions, requests):
+    print(f"{requests} submissions per run, {users} users, {questions} questions\n")
+    print(f"{'threads':>7} {'backend':<8} {'rps':>9} {'p50':>10} {'p95':>10} {'errors':>7}")
+    for name, engine in BACKENDS:
+        for threads, rate, latencies, errors in measure(
+                workdir, engine, thread_counts, users, questions, requests):
+            p50 = f'{percentile(latencies, 0.50) * 1000:8.2f}ms' if latencies else f"{'-':>10}"
+            p95 = f'{percentile(latencies, 0.95) * 1000:8.2f}ms' if latencies else f"{'-':>10}"
+            print(f"{threads:>7} {name:<8} {rate:9.1f} {p50} {p95} {errors:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, action='append',
+                        help='Concurrent submitting threads; repeat for several (default: 1, 8 and 32)')
+    parser.add_argument('--users', type=int, default=32, help='Students submitting')
+    parser.add_argument('--questions', type=int, default=40, help='Questions in the submitted assessment')
+    parser.add_argument('--requests', type=int, default=300, help='Submissions per run')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ.setdefault('CACHE_LOCATION', os.path.join(workdir, 'cache'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    django.setup()
+
+    try:
+        run(workdir, args.threads or [1, 8, 32], args.users, args.questions, args.requests)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Startup benchmark: ``python -X importtime`` for a cold ``core.wsgi`` boot.
+
+Boots the WSGI application and loads the URLconf in a fresh interpreter, as a
+worker does before serving its first request, then reports the slowest imports
+and whether any heavy scientific package was pulled in.
+
+Run with ``python -m benchmarks.startup``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+BOOT_SNIPPET = (
+    "import core.wsgi\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+
+# Packages that must stay out of the boot path; engines import them lazily
+HEAVY_PACKAGES = ('numpy', 'scipy', 'pandas', 'sklearn')
+
+
+def parse_importtime(stderr):
+    """Return {module: (self_us, cumulative_us)} from -X importtime output"""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        timings[module.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_boot():
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='core.settings')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT_SNIPPET],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def run(repeat, top):
+    runs = [measure_boot() for _ in range(repeat)]
+    # Keep the fastest run per module to filter out disk cache noise
+    timings = {
+        module: min(run[module] for run in runs if module in run)
+        for module in runs[-1]
+    }
+    total_us = sum(self_us for self_us, _ in timings.values())
+    heavy = [package for package in HEAVY_PACKAGES if package in timings]
+
+    print(f"modules imported: {len(timings)}")
+    print(f"total import time: {total_us / 1000:.1f} ms")
+    print(f"\nslowest {top} imports (cumulative):")
+    slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for module, (_, cumulative_us) in slowest:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {module}")
+
+    if heavy:
+        print(f"\nheavy packages imported at boot: {', '.join(heavy)}")
+    else:
+        print("\nno heavy packages imported at boot")
+    return heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters to boot')
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list')
+    parser.add_argument('--fail-on-heavy', action='store_true',
+                        help='Exit non-zero if a heavy package is imported at boot')
+    args = parser.parse_args()
+
+    heavy = run(args.repeat, args.top)
+    if heavy and args.fail_on_heavy:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
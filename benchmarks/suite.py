@@ -0,0 +1,315 @@
+"""Benchmark suite: the recommendation and assessment hot paths, with baselines.
+
+Each case is timed over a grid of inputs:
+
+  recommend    generate_career_recommendations for one user, by catalog size
+               and the number of skills the user lists
+  skill_match  calculate_skill_match against one career, by user skill count
+  personality  scoring one result's answers (assessments.scoring.score_answers,
+               formerly calculate_personality_type), by answer count
+  submit       a take_assessment POST through the WSGI stack, by question count
+  dashboard    a recommendation dashboard render through the WSGI stack
+
+and reports p50/p95/p99 and the mean over ``--repeat`` samples. A sample of a
+fast call is the mean of a loop that runs for at least ``--min-time``. The
+requests run against a throwaway test database, as in ``benchmarks.load``.
+
+``--save`` stores the results as a JSON baseline; ``--compare`` reports the
+change in each case's p50 against a baseline and exits with status 1 if any
+case slowed down by more than ``--tolerance``. Only compare baselines taken on
+the same machine.
+
+Run with ``python -m benchmarks.suite``.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import cycle
+from types import SimpleNamespace
+
+from benchmarks.assessment_scoring import synthetic_payloads
+from benchmarks.engines import SKILLS, percentile, synthetic_catalog, synthetic_users
+from benchmarks.load import (
+    build_assessment, call, create_database, destroy_database, seed, signed_in_factory, submission,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'var', 'benchmarks', 'baseline.json')
+
+# Skills users list that no career requires
+UNMATCHED_SKILLS = [f'Hobby {i}' for i in range(500)]
+
+# Requests served before a web case is timed, filling the caches and compiled assessments
+WARMUP = 5
+
+
+def user_skills(count, rng):
+    """`count` comma separated skills, about half of them required by some career"""
+    known = min(len(SKILLS), (count + 1) // 2)
+    return ', '.join(rng.sample(SKILLS, known) + rng.sample(UNMATCHED_SKILLS, count - known))
+
+
+def sample(func, repeat, number=None, min_time=0.005):
+    """`repeat` per-call timings of func(); `number` calls per timing, by default enough to take min_time"""
+    def timing(number):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - started
+
+    if number is None:
+        number = 1
+        while (elapsed := timing(number)) < min_time:
+            number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)) + 1)
+    return [timing(number) / number for _ in range(repeat)]
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        'n': len(timings),
+        'mean': statistics.fmean(timings),
+        'p50': percentile(timings, 0.50),
+        'p95': percentile(timings, 0.95),
+        'p99': percentile(timings, 0.99),
+    }
+
+
+def case_key(case, params):
+    if not params:
+        return case
+    return f"{case}[{','.join(f'{name}={value}' for name, value in params.items())}]"
+
+
+def recommend(options, site):
+    from recommendations.engines import build_engine
+
+    rng = random.Random(options.seed)
+    for size in options.catalog_sizes:
+        engine = build_engine(options.backend)
+        engine.set_career_database(synthetic_catalog(size, rng))
+        profiles = synthetic_users(50, rng)
+        # Build the precomputed arrays before timing
+        engine.generate_career_recommendations(profiles[0], options.top_n)
+        for count in options.skill_counts:
+            users = cycle([dict(profile, skills=user_skills(count, rng)) for profile in profiles])
+            yield (
+                {'backend': options.backend, 'careers': size, 'skills': count},
+                lambda: engine.generate_career_recommendations(next(users), options.top_n),
+                None,
+            )
+
+
+def skill_match(options, site):
+    from recommendations.engines import build_engine
+
+    rng = random.Random(options.seed)
+    engine = build_engine(options.backend)
+    required = cycle([career['skills'] for career in synthetic_catalog(100, rng)])
+    for count in options.skill_counts:
+        skills = user_skills(count, rng)
+        yield {'skills': count}, lambda: engine.calculate_skill_match(skills, next(required)), None
+
+
+def personality(options, site):
+    from assessments.scoring import score_answers
+
+    for count in options.question_counts:
+        payloads = cycle(synthetic_payloads(100, count, options.seed))
+        yield {'answers': count}, lambda: score_answers(next(payloads)), None
+
+
+def serve(application, environs):
+    """Timed function serving the next request; every environ is fresh since WSGI consumes its input"""
+    environs = iter(environs)
+    for _ in range(WARMUP):
+        call(application, next(environs))
+
+    def request():
+        environ = next(environs)
+        if not call(application, environ):
+            raise SystemExit(f"{environ['REQUEST_METHOD']} {environ['PATH_INFO']} failed")
+    return request
+
+
+def submit(options, site):
+    from django.urls import reverse
+
+    rng = random.Random(options.seed)
+    for count in options.question_counts:
+        assessment = site.assessments[count]
+        url = reverse('take_assessment', args=[assessment.id])
+        environs = [
+            site.factories[i % len(site.factories)].post(url, submission(assessment, rng)).environ
+            for i in range(WARMUP + options.repeat)
+        ]
+        yield {'questions': count}, serve(site.application, environs), 1
+
+
+def dashboard(options, site):
+    from django.urls import reverse
+
+    url = reverse('recommendations:recommendation_dashboard')
+    environs = [
+        site.factories[i % len(site.factories)].get(url).environ for i in range(WARMUP + options.repeat)
+    ]
+    yield {}, serve(site.application, environs), 1
+
+
+CASES = {
+    'recommend': recommend,
+    'skill_match': skill_match,
+    'personality': personality,
+    'submit': submit,
+    'dashboard': dashboard,
+}
+WEB_CASES = {'submit', 'dashboard'}
+
+
+def build_site(users, question_counts):
+    """Signed-in students, one assessment per question count, and the WSGI application"""
+    import logging
+
+    from django.core.wsgi import get_wsgi_application
+
+    students, first = seed(users, question_counts[0])
+    assessments = {question_counts[0]: first}
+    for count in question_counts[1:]:
+        if count not in assessments:
+            assessments[count] = build_assessment(count)
+    application = get_wsgi_application()
+    # A failed request stops the run with its own message; skip the traceback in the log
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    return SimpleNamespace(
+        application=application,
+        factories=[signed_in_factory(student) for student in students],
+        assessments=assessments,
+    )
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:7.2f}{unit:<2}'
+    return f'{seconds / 1e-9:7.0f}ns'
+
+
+def compare(results, baseline, tolerance):
+    """{case key: p50 change against the baseline} and the keys that slowed down beyond tolerance"""
+    changes, regressions = {}, []
+    for key, result in results.items():
+        if key in baseline:
+            changes[key] = result['p50'] / baseline[key]['p50'] - 1
+            if changes[key] > tolerance:
+                regressions.append(key)
+    return changes, regressions
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'machine': platform.platform(),
+            'python': platform.python_version(),
+            'results': results,
+        }, f, indent=2)
+        f.write('\n')
+
+
+def run(options, workdir):
+    baseline = load_baseline(options.compare)['results'] if options.compare else {}
+
+    site, old_name = None, None
+    if WEB_CASES & set(options.cases):
+        old_name = create_database(workdir)
+    try:
+        if old_name is not None:
+            site = build_site(options.users, options.question_counts)
+
+        print(f"{'case':<52} {'n':>4} {'p50':>9} {'p95':>9} {'p99':>9} {'mean':>9}"
+              + (f" {'vs base':>8}" if options.compare else ''))
+        results = {}
+        for case in options.cases:
+            for params, func, number in CASES[case](options, site):
+                key = case_key(case, params)
+                results[key] = summarize(sample(func, options.repeat, number, options.min_time))
+                line = f'{key:<52} {results[key]["n"]:>4} ' + ' '.join(
+                    format_time(results[key][stat]) for stat in ('p50', 'p95', 'p99', 'mean')
+                )
+                if options.compare:
+                    change = compare({key: results[key]}, baseline, options.tolerance)[0].get(key)
+                    line += '      new' if change is None else f' {change:+8.1%}'
+                print(line, flush=True)
+    finally:
+        if old_name is not None:
+            destroy_database(old_name)
+
+    if options.save:
+        save_baseline(options.save, results)
+        print(f'\nbaseline saved to {options.save}')
+    if options.compare:
+        regressions = compare(results, baseline, options.tolerance)[1]
+        print(f'\n{len(regressions)} of {len(results)} cases more than {options.tolerance:.0%} slower '
+              f'than {options.compare}')
+        for key in regressions:
+            print(f'  {key}')
+        if regressions:
+            sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--case', dest='cases', action='append', choices=list(CASES),
+                        help='Case to run; repeat for several (default: all)')
+    parser.add_argument('--backend', help='Recommendation engine backend (default: the setting)')
+    parser.add_argument('--catalog-sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000],
+                        help='Synthetic catalog sizes for recommend')
+    parser.add_argument('--skill-counts', type=int, nargs='+', default=[0, 5, 20, 50],
+                        help='Skills per user for recommend and skill_match')
+    parser.add_argument('--question-counts', type=int, nargs='+', default=[10, 60],
+                        help='Answers per result for personality and submit')
+    parser.add_argument('--users', type=int, default=10, help='Signed-in students sending requests')
+    parser.add_argument('--repeat', type=int, default=50, help='Samples per case')
+    parser.add_argument('--min-time', type=float, default=0.005, help='Seconds a sample of a fast call loops for')
+    parser.add_argument('--top-n', type=int, default=10, help='Recommendations per user')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic inputs')
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help=f'Store the results as a baseline (default path: {DEFAULT_BASELINE})')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help='Compare against a stored baseline; exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='p50 slowdown counted as a regression (default: 0.2, i.e. 20%%)')
+    options = parser.parse_args()
+    options.cases = options.cases or list(CASES)
+
+    # Keep the file cache and SQLite database of the run out of the project directory
+    workdir = tempfile.mkdtemp()
+    os.environ.setdefault('CACHE_LOCATION', os.path.join(workdir, 'cache'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    from django.conf import settings
+    django.setup()
+
+    options.backend = options.backend or settings.RECOMMENDATION_ENGINE_BACKEND
+    try:
+        run(options, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
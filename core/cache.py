@@ -0,0 +1,67 @@
+"""Cache backends that count hits and misses.
+
+Each backend records lookups under its LOCATION in a process-wide counter, so
+``cache_stats()`` reports the traffic seen by the current worker. Counters
+reset when the worker restarts.
+"""
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache as BaseFileBasedCache
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django.core.cache.backends.memcached import PyMemcacheCache as BasePyMemcacheCache
+
+_counters = Counter()
+_lock = threading.Lock()
+_missing = object()
+
+
+def record(location, hit):
+    with _lock:
+        _counters[location, 'hits' if hit else 'misses'] += 1
+
+
+def cache_stats():
+    """Hit and miss counts for every configured cache alias"""
+    stats = {}
+    with _lock:
+        for alias, config in settings.CACHES.items():
+            location = str(config.get('LOCATION', ''))
+            hits = _counters[location, 'hits']
+            misses = _counters[location, 'misses']
+            lookups = hits + misses
+            stats[alias] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': round(hits / lookups, 4) if lookups else None,
+            }
+    return stats
+
+
+def reset_cache_stats():
+    with _lock:
+        _counters.clear()
+
+
+class CacheStatsMixin:
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.stats_location = str(location)
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version=version)
+        record(self.stats_location, value is not _missing)
+        return default if value is _missing else value
+
+
+class FileBasedCache(CacheStatsMixin, BaseFileBasedCache):
+    pass
+
+
+class LocMemCache(CacheStatsMixin, BaseLocMemCache):
+    pass
+
+
+class PyMemcacheCache(CacheStatsMixin, BasePyMemcacheCache):
+    pass
@@ -0,0 +1,35 @@
+from django.conf import settings
+
+from .routers import replica_configured, use_primary
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+
+class ReplicaPinMiddleware:
+    """Read-your-writes: pin a client's reads to the primary for a while after it writes.
+
+    A request with an unsafe method reads from the primary and sets a cookie
+    that pins the client's requests to the primary for
+    DATABASE_REPLICA_PIN_SECONDS, longer than the replica is expected to lag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        writes = request.method not in SAFE_METHODS
+        if writes or settings.DATABASE_REPLICA_PIN_COOKIE in request.COOKIES:
+            with use_primary():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+
+        if writes:
+            response.set_cookie(
+                settings.DATABASE_REPLICA_PIN_COOKIE, "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS, httponly=True, samesite="Lax"
+            )
+        return response
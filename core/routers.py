@@ -0,0 +1,84 @@
+"""Read replica routing.
+
+Writes always go to the primary. Reads go to the primary too, unless they
+run under ``use_replica()``, which read-only views enter through
+``replica_view``, or name ``replica_alias()`` explicitly, as catalog
+snapshots do. ``use_primary()`` pins a block's reads to the primary even
+inside ``use_replica()``. Code that writes and then reads what it wrote runs
+under it, and ReplicaPinMiddleware runs every request of a client that wrote
+recently under it, so users always see their own writes however far the
+replica lags.
+
+Without a "replica" database alias every read goes to the primary.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+
+# None reads from the primary, REPLICA_DB_ALIAS from the replica; DEFAULT_DB_ALIAS pins the primary
+_reads = ContextVar("database_reads", default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in connections
+
+
+def replica_alias():
+    """The replica's alias, or the primary's when there is no replica"""
+    return REPLICA_DB_ALIAS if replica_configured() else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def _read_from(alias):
+    token = _reads.set(alias)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+@contextmanager
+def use_replica():
+    """Send the block's reads to the replica unless they are pinned to the primary"""
+    if _reads.get() == DEFAULT_DB_ALIAS:
+        yield
+    else:
+        with _read_from(REPLICA_DB_ALIAS):
+            yield
+
+
+def use_primary():
+    """Pin the block's reads to the primary, even inside use_replica()"""
+    return _read_from(DEFAULT_DB_ALIAS)
+
+
+def replica_view(view):
+    """Serve a read-only view from the replica, authentication included"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with use_replica():
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _reads.get() == REPLICA_DB_ALIAS and replica_configured():
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Not the instance's own database: rows read from the replica are saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same rows
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The replica gets its schema from the primary
+        return db != REPLICA_DB_ALIAS
@@ -0,0 +1,33 @@
+"""Test runner that keeps the test run off the deployment's caches.
+
+The default cache is a shared directory (or memcached) that outlives the
+process, so tests clearing it or leaving generation tokens behind would
+touch a developer's real cache. The run gets process-local caches instead.
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "core.cache.LocMemCache",
+        "LOCATION": "test-default",
+        "TIMEOUT": 300,
+    },
+    "recommendations": {
+        "BACKEND": "core.cache.LocMemCache",
+        "LOCATION": "test-recommendations",
+        "TIMEOUT": 3600,
+        "OPTIONS": {"MAX_ENTRIES": 10000, "CULL_FREQUENCY": 10},
+    },
+}
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_override = override_settings(CACHES=TEST_CACHES)
+        self.cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_override.disable()
+        super().teardown_test_environment(**kwargs)
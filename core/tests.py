@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from assessments.models import AssessmentResult
+from assessments.tests import build_assessment
+
+from .cache import cache_stats, reset_cache_stats
+from .routers import REPLICA_DB_ALIAS, use_primary, use_replica
+from .sqlite.base import DatabaseWrapper
+
+User = get_user_model()
+
+
+class CacheStatsTests(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        caches_setting = {
+            "default": {
+                "BACKEND": "core.cache.FileBasedCache",
+                "LOCATION": self.cache_dir,
+            },
+            "recommendations": {
+                "BACKEND": "core.cache.LocMemCache",
+                "LOCATION": "cache-stats-tests",
+            },
+        }
+        override = override_settings(CACHES=caches_setting)
+        override.enable()
+        self.addCleanup(override.disable)
+        reset_cache_stats()
+
+    def test_counts_hits_and_misses_per_alias(self):
+        cache = caches["default"]
+        self.assertIsNone(cache.get("missing"))
+        cache.set("present", 0)
+        self.assertEqual(cache.get("present"), 0)
+        self.assertEqual(cache.get("missing", "fallback"), "fallback")
+
+        stats = cache_stats()
+        self.assertEqual(stats["default"], {"hits": 1, "misses": 2, "hit_ratio": 0.3333})
+        self.assertEqual(stats["recommendations"]["hit_ratio"], None)
+
+    def test_home_page_is_served_from_cache(self):
+        self.client.get(reverse("home"))
+        misses = cache_stats()["default"]["misses"]
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(cache_stats()["default"]["hits"], 0)
+        self.assertEqual(cache_stats()["default"]["misses"], misses)
+
+    def test_stats_endpoint_requires_staff(self):
+        url = reverse("cache_stats")
+        user = User.objects.create_user(username="student", password="secret")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("default", response.json()["caches"])
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def open(self, **pragmas):
+        settings_dict = {
+            **connection.settings_dict,
+            "NAME": os.path.join(self.directory, "db.sqlite3"),
+            "OPTIONS": {"pragmas": pragmas},
+        }
+        wrapper = DatabaseWrapper(settings_dict, "tuning")
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_new_connections_apply_pragmas(self):
+        wrapper = self.open()
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 5000)
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -65536)
+
+    def test_options_override_pragmas(self):
+        wrapper = self.open(busy_timeout=250)
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 250)
+
+    def test_transactions_take_the_write_lock_up_front(self):
+        first = self.open()
+        second = self.open(busy_timeout=0)
+        first._start_transaction_under_autocommit()
+        self.addCleanup(first.cursor().execute, "ROLLBACK")
+        # The first transaction hasn't written anything, yet a second writer can't start
+        with self.assertRaisesMessage(OperationalError, "database is locked"):
+            second._start_transaction_under_autocommit()
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """A SQLite file stands in for the replica; it only has the rows replicate() copies to it"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Added after the test databases are set up: the test runner doesn't know this alias
+        cls.directory = tempfile.mkdtemp()
+        connections.settings[REPLICA_DB_ALIAS] = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            "NAME": os.path.join(cls.directory, "replica.sqlite3"),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA_DB_ALIAS].close()
+        del connections[REPLICA_DB_ALIAS]
+        del connections.settings[REPLICA_DB_ALIAS]
+        shutil.rmtree(cls.directory, ignore_errors=True)
+        super().tearDownClass()
+
+    @staticmethod
+    def replicate():
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[REPLICA_DB_ALIAS]
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="student", password="secret")
+        self.replicate()
+
+    def test_reads_follow_the_context(self):
+        self.assertEqual(User.objects.all().db, DEFAULT_DB_ALIAS)
+        with use_replica():
+            self.assertEqual(User.objects.all().db, REPLICA_DB_ALIAS)
+            with use_primary():
+                self.assertEqual(User.objects.all().db, DEFAULT_DB_ALIAS)
+        with use_primary(), use_replica():
+            self.assertEqual(User.objects.all().db, DEFAULT_DB_ALIAS)
+
+    def test_rows_read_from_the_replica_are_saved_to_the_primary(self):
+        with use_replica():
+            user = User.objects.get(username="student")
+            user.first_name = "Ada"
+            user.save()
+
+        self.assertEqual(User.objects.get(username="student").first_name, "Ada")
+        self.assertEqual(User.objects.using(REPLICA_DB_ALIAS).get(username="student").first_name, "")
+
+    def test_clients_read_their_own_writes(self):
+        self.client.force_login(self.user)
+        assessment = build_assessment(4)
+        self.replicate()
+
+        data = {
+            f"question_{question.id}": str(question.choices.all()[0].id)
+            for question in assessment.questions.prefetch_related("choices")
+        }
+        response = self.client.post(reverse("take_assessment", args=[assessment.id]), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(settings.DATABASE_REPLICA_PIN_COOKIE, response.cookies)
+        url = reverse("assessment_results", args=[AssessmentResult.objects.get(user=self.user).id])
+
+        # Pinned to the primary after the POST
+        self.assertEqual(self.client.get(url).status_code, 200)
+        # Once the pin expires the view reads the replica, which hasn't caught up yet
+        del self.client.cookies[settings.DATABASE_REPLICA_PIN_COOKIE]
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.replicate()
+        self.assertEqual(self.client.get(url).status_code, 200)
@@ -2,11 +2,20 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.cache import cache_page
 from django.views.generic import TemplateView
 
+from .views import cache_stats_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("", TemplateView.as_view(template_name="home.html"), name="home"),
+    path(
+        "",
+        cache_page(settings.PAGE_CACHE_TIMEOUT)(
+            TemplateView.as_view(template_name="home.html")
+        ),
+        name="home",
+    ),
     path(
         "dashboard/",
         TemplateView.as_view(template_name="dashboard.html"),
@@ -14,6 +23,7 @@ urlpatterns = [
     ),
     path("users/", include("users.urls")),
     path("assessments/", include("assessments.urls")),
+    path("monitoring/cache-stats/", cache_stats_view, name="cache_stats"),
 ]
 
 # Only include these URLs if the apps exist
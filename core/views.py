@@ -0,0 +1,12 @@
+import os
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from .cache import cache_stats
+
+
+@staff_member_required
+def cache_stats_view(request):
+    """Cache hit/miss counters for this worker process"""
+    return JsonResponse({"pid": os.getpid(), "caches": cache_stats()})
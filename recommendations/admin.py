@@ -1,3 +1,21 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Career, CareerSkill, PersonalityFit
+
+
+class CareerSkillInline(admin.TabularInline):
+    model = CareerSkill
+    extra = 1
+
+
+class PersonalityFitInline(admin.TabularInline):
+    model = PersonalityFit
+    extra = 1
+
+
+@admin.register(Career)
+class CareerAdmin(admin.ModelAdmin):
+    list_display = ("title", "category", "demand_score", "job_growth", "is_active")
+    list_filter = ("is_active", "category")
+    search_fields = ("title",)
+    inlines = [CareerSkillInline, PersonalityFitInline]
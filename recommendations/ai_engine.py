@@ -1,21 +1,116 @@
-import json
 import numpy as np
-import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.cluster import KMeans
-import requests
-from datetime import datetime
+from itertools import islice
 import logging
 
+from .artifacts import catalog_fingerprint, default_index_dir, open_artifact, write_artifact
+from .feature_matrix import CareerFeatureMatrix
+from .ranking import top_k
+from .scorers import load_scorers, scoring_key, weighted_total
+from .skill_index import parse_user_skills
+from .text_index import CareerTextIndex
+
 logger = logging.getLogger(__name__)
 
 class AdvancedCareerAI:
-    def __init__(self):
+    SCORING_MODES = ('matrix', 'loop')
+    ARTIFACT_NAME = 'advanced'
+
+    def __init__(self, scoring_mode='matrix', index_dir=None, catalog=None, scorers=None):
+        if scoring_mode not in self.SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {scoring_mode}")
+        self.scoring_mode = scoring_mode
+        # Weighted components of a match (see recommendations.scorers)
+        self.scorers = load_scorers() if scorers is None else scorers
+        self.index_dir = index_dir or default_index_dir()
+        # Optional source of catalog snapshots (see recommendations.catalog);
+        # the built-in career database is used until it provides one
+        self.catalog = catalog
+        self.catalog_version = None
         self.career_database = self.load_career_database()
         self.skill_vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
         self.personality_mapping = self.load_personality_mapping()
+        self.personality_types = list(self.personality_mapping)
+        self.personality_index = {ptype: i for i, ptype in enumerate(self.personality_types)}
+        self.personality_similarity = self.build_personality_similarity()
+        self.career_personality_cache = {}
         self.industry_trends = self.load_industry_trends()
+        self._feature_matrix = None
+        self._text_index = None
+        self._artifact = False
+
+    def sync_catalog(self):
+        """Switch to the catalog source's latest snapshot if its version moved"""
+        if self.catalog is None:
+            return
+        snapshot = self.catalog.snapshot()
+        if snapshot is not None and snapshot.version != self.catalog_version:
+            self.set_career_database(snapshot.careers)
+            self.catalog_version = snapshot.version
+
+    def set_career_database(self, careers):
+        """Replace the catalog and drop every index derived from it"""
+        self.career_database = careers
+        # Keyed by the trait lists of the old catalog; without this it grows on every reload
+        self.career_personality_cache = {}
+        self._feature_matrix = None
+        self._text_index = None
+        self._artifact = False
+
+    @property
+    def artifact(self):
+        """Prebuilt career index for the current catalog, or None if there is none on disk"""
+        if self._artifact is False:
+            self._artifact = open_artifact(self.index_dir, self.ARTIFACT_NAME, self.catalog_fingerprint())
+        return self._artifact
+
+    @property
+    def feature_matrix(self):
+        """Career feature matrix, memory-mapped from the artifact or built once on first use"""
+        if self._feature_matrix is None:
+            if self.artifact is not None:
+                self._feature_matrix = CareerFeatureMatrix.from_artifact(self, self.career_database, self.artifact)
+            else:
+                self._feature_matrix = CareerFeatureMatrix(self, self.career_database)
+        return self._feature_matrix
+
+    @property
+    def text_index(self):
+        """TF-IDF index over career text, loaded from the artifact or fitted once on first use"""
+        if self._text_index is None:
+            if self.artifact is not None:
+                self._text_index = CareerTextIndex.from_artifact(self.artifact)
+            else:
+                self._text_index = CareerTextIndex.build(self.career_database, self.skill_vectorizer)
+        return self._text_index
+
+    def catalog_fingerprint(self):
+        return catalog_fingerprint(
+            self.career_database, self.personality_mapping, self.industry_trends,
+            self.skill_vectorizer.get_params(), [scorer.config() for scorer in self.scorers]
+        )
+
+    @property
+    def scoring_key(self):
+        """Short name of the scorer configuration, for keys that outlive a process"""
+        return scoring_key(self.scorers)
+
+    def write_career_index(self, index_dir=None):
+        """Fit every index for the current catalog and write it as a new artifact version"""
+        matrix = CareerFeatureMatrix(self, self.career_database)
+        text_index = CareerTextIndex.build(self.career_database, self.skill_vectorizer)
+
+        arrays, vocab, shapes = matrix.to_arrays()
+        text_arrays, text_shapes, files = text_index.to_arrays()
+        arrays.update(text_arrays)
+        shapes.update(text_shapes)
+
+        path = write_artifact(
+            index_dir or self.index_dir, self.ARTIFACT_NAME, self.catalog_fingerprint(),
+            arrays, vocab, shapes=shapes, files=files
+        )
+        self.set_career_database(self.career_database)
+        return path
         
     def load_career_database(self):
         """Load comprehensive career database"""
@@ -144,25 +239,34 @@ class AdvancedCareerAI:
             'Business': {'growth': 16, 'remote_work': 65, 'salary_growth': 6}
         }
     
+    def build_personality_similarity(self):
+        """Cosine similarity between every pair of personality types"""
+        vectors = [np.array(list(profile.values())) for profile in self.personality_mapping.values()]
+        table = np.empty((len(vectors), len(vectors)))
+        for i, user_vec in enumerate(vectors):
+            for j, career_vec in enumerate(vectors):
+                table[i, j] = np.dot(user_vec, career_vec) / (np.linalg.norm(user_vec) * np.linalg.norm(career_vec))
+        return table
+    
+    def career_personality_vector(self, career_traits):
+        """Average compatibility of every personality type with a career's preferred personalities"""
+        key = tuple(career_traits)
+        vector = self.career_personality_cache.get(key)
+        if vector is None:
+            cols = [self.personality_index[trait] for trait in career_traits if trait in self.personality_index]
+            if cols:
+                vector = np.array([np.mean(row[cols]) for row in self.personality_similarity])
+            else:
+                vector = np.full(len(self.personality_types), 0.5)
+            self.career_personality_cache[key] = vector
+        return vector
+    
     def calculate_personality_compatibility(self, user_personality, career_traits):
         """Advanced personality compatibility calculation"""
-        if not user_personality or user_personality not in self.personality_mapping:
+        if not user_personality or user_personality not in self.personality_index:
             return 0.5
         
-        user_profile = self.personality_mapping[user_personality]
-        
-        # Calculate average compatibility with career's preferred personalities
-        compatibilities = []
-        for trait in career_traits:
-            if trait in self.personality_mapping:
-                career_profile = self.personality_mapping[trait]
-                # Cosine similarity between personality vectors
-                user_vec = np.array(list(user_profile.values()))
-                career_vec = np.array(list(career_profile.values()))
-                similarity = np.dot(user_vec, career_vec) / (np.linalg.norm(user_vec) * np.linalg.norm(career_vec))
-                compatibilities.append(similarity)
-        
-        return np.mean(compatibilities) if compatibilities else 0.5
+        return self.career_personality_vector(career_traits)[self.personality_index[user_personality]]
     
     def calculate_skill_match(self, user_skills, required_skills):
         """Advanced skill matching using TF-IDF and semantic similarity"""
@@ -236,88 +340,112 @@ class AdvancedCareerAI:
     
     def generate_career_recommendations(self, user_data, top_n=10):
         """Generate comprehensive career recommendations"""
+        self.sync_catalog()
+        if self.scoring_mode == 'matrix':
+            return self.generate_matrix_recommendations(user_data, top_n)
+
         recommendations = []
+        user_skills = parse_user_skills(user_data.get('skills', ''))
         
-        for career in self.career_database:
-            # Calculate various compatibility scores
-            personality_score = self.calculate_personality_compatibility(
-                user_data.get('personality_type'), 
-                career['personality_traits']
-            )
-            
-            skill_score = self.calculate_skill_match(
-                user_data.get('skills', ''),
-                career['skills']
-            )
-            
-            education_score = self.calculate_education_compatibility(
-                user_data.get('education_level', 'high_school'),
-                career['education_required']
-            )
-            
-            market_score = self.calculate_market_factors(
-                career, 
-                user_data.get('preferences', {})
-            )
-            
-            # Weighted total score
-            total_score = (
-                personality_score * 0.25 +
-                skill_score * 0.30 +
-                education_score * 0.20 +
-                market_score * 0.25
-            )
-            
-            # Skill gap analysis
-            user_skills = [skill.strip().lower() for skill in user_data.get('skills', '').split(',')] if user_data.get('skills') else []
-            missing_skills = [
-                skill for skill in career['skills'] 
-                if not any(user_skill in skill.lower() for user_skill in user_skills)
-            ][:5]  # Top 5 missing skills
-            
-            # Learning path suggestions
-            learning_path = self.generate_learning_path(career, user_skills)
-            
-            recommendations.append({
-                'career': career['title'],
-                'category': career['category'],
-                'match_score': round(total_score * 100, 1),
-                'detailed_scores': {
-                    'personality': round(personality_score * 100, 1),
-                    'skills': round(skill_score * 100, 1),
-                    'education': round(education_score * 100, 1),
-                    'market': round(market_score * 100, 1)
-                },
-                'description': career['description'],
-                'salary_range': career['salary_range'],
-                'job_growth': career['job_growth'],
-                'experience_level': career['experience_level'],
-                'missing_skills': missing_skills,
-                'learning_path': learning_path,
-                'companies': career['companies'],
-                'day_to_day': career['day_to_day'],
-                'demand_score': career['demand_score'],
-                'remote_friendly': career['remote_friendly']
-            })
+        # Score every career, then enrich only the top N
+        for row, total_score, scores in top_k(self.score_careers(user_data), top_n, ndigits=1):
+            career = self.career_database[row]
+            recommendations.append(self.build_recommendation(
+                career, total_score, scores,
+                missing_skills=self.scan_missing_skills(career['skills'], user_skills)[:5],
+                priority_skills=self.scan_missing_skills(career['skills'][:5], user_skills)
+            ))
+        return recommendations
+
+    def score_careers(self, user_data):
+        """Yield (row, total, component scores) for every career"""
+        for row, career in enumerate(self.career_database):
+            scores = [scorer.score(self, user_data, career) for scorer in self.scorers]
+            yield row, weighted_total(self.scorers, scores), scores
+
+    def generate_matrix_recommendations(self, user_data, top_n=10):
+        """Score the user against every career with array operations, then enrich only the top N"""
+        return next(self.generate_batch_recommendations([user_data], top_n))
+
+    def generate_batch_recommendations(self, users, top_n=10, chunk_size=None):
+        """Yield the top N recommendations for each user in `users`, in input order.
+
+        Users are scored in chunks as a users x careers matrix, so memory stays
+        bounded no matter how many users the iterable produces.
+        """
+        self.sync_catalog()
+        if self.scoring_mode != 'matrix':
+            for user_data in users:
+                yield self.generate_career_recommendations(user_data, top_n)
+            return
+
+        matrix = self.feature_matrix
+        users = iter(users)
+        chunk_size = chunk_size or matrix.chunk_size()
+        while True:
+            chunk = list(islice(users, chunk_size))
+            if not chunk:
+                return
+
+            # One pass over the skill index per user serves scoring and gap analysis
+            skill_matches = [matrix.skills.match(user_data.get('skills', '')) for user_data in chunk]
+            total, components = matrix.score_batch(chunk, skill_matches)
+            for row, (match, top_rows) in enumerate(zip(skill_matches, matrix.top_k(total, top_n))):
+                yield [
+                    self.build_recommendation(
+                        matrix.careers[col], float(total[row, col]),
+                        [float(component[row, col]) for component in components],
+                        missing_skills=matrix.skills.missing_skills(col, match, limit=5),
+                        priority_skills=matrix.skills.missing_skills(col, match, within=5)
+                    )
+                    for col in top_rows
+                ]
+
+    def scan_missing_skills(self, required_skills, user_skills):
+        """Required skills that no user skill is a substring of"""
+        return [
+            skill for skill in required_skills 
+            if not any(user_skill in skill.lower() for user_skill in user_skills)
+        ]
+
+    def build_recommendation(self, career, total_score, scores, missing_skills, priority_skills):
+        """Assemble the recommendation payload for a single scored career; `scores` follow self.scorers"""
+        # Learning path suggestions
+        learning_path = self.generate_learning_path(career, priority_skills=priority_skills)
         
-        # Sort by match score and return top N
-        recommendations.sort(key=lambda x: x['match_score'], reverse=True)
-        return recommendations[:top_n]
+        return {
+            'career': career['title'],
+            'category': career['category'],
+            'match_score': round(total_score * 100, 1),
+            'detailed_scores': {
+                scorer.name: round(score * 100, 1) for scorer, score in zip(self.scorers, scores)
+            },
+            'description': career['description'],
+            'salary_range': career['salary_range'],
+            'job_growth': career['job_growth'],
+            'experience_level': career['experience_level'],
+            'missing_skills': missing_skills,
+            'learning_path': learning_path,
+            'companies': career['companies'],
+            'day_to_day': career['day_to_day'],
+            'demand_score': career['demand_score'],
+            'remote_friendly': career['remote_friendly']
+        }
     
-    def generate_learning_path(self, career, user_skills):
+    def generate_learning_path(self, career, user_skills=(), priority_skills=None):
         """Generate personalized learning path to bridge skill gaps"""
+        # Identify priority skills to learn among the top 5 most important skills,
+        # unless the caller already resolved them from the skill index
+        if priority_skills is None:
+            priority_skills = self.scan_missing_skills(career['skills'][:5], user_skills)
+
         path = {
-            'priority_skills': [],
+            'priority_skills': list(priority_skills),
             'recommended_courses': [],
             'timeline_estimate': '3-6 months',
             'resources': []
         }
         
-        # Identify priority skills to learn
-        for skill in career['skills'][:5]:  # Top 5 most important skills
-            if not any(user_skill in skill.lower() for user_skill in user_skills):
-                path['priority_skills'].append(skill)
-        
         # Generate course recommendations based on missing skills
         course_mapping = {
             'Python': ['Python for Everybody (Coursera)', 'Automate the Boring Stuff with Python'],
@@ -342,6 +470,18 @@ class AdvancedCareerAI:
         
         return path
     
+    def find_similar_careers(self, profile_text, top_n=10):
+        """Careers whose skills and descriptions are most similar to a free-text profile"""
+        self.sync_catalog()
+        return [
+            {
+                'career': self.career_database[row]['title'],
+                'category': self.career_database[row]['category'],
+                'similarity': round(similarity * 100, 1)
+            }
+            for row, similarity in self.text_index.query(profile_text, top_n)
+        ]
+    
     def analyze_career_clusters(self, user_data):
         """Cluster careers into categories for better insights"""
         recommendations = self.generate_career_recommendations(user_data, top_n=20)
@@ -355,5 +495,9 @@ class AdvancedCareerAI:
         
         return clusters
 
-# Global instance
-career_ai = AdvancedCareerAI()
\ No newline at end of file
+def __getattr__(name):
+    # Global instance, created on first access (see recommendations.engines)
+    if name == 'career_ai':
+        from .engines import get_career_ai
+        return get_career_ai()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
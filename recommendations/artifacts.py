@@ -0,0 +1,164 @@
+"""Versioned on-disk career index artifacts.
+
+An artifact is a directory of plain ``.npy`` arrays plus JSON metadata, written
+once by ``manage.py build_career_index`` and memory-mapped read-only by every
+worker, so all processes share one page-cache copy of the fitted index::
+
+    <CAREER_INDEX_DIR>/<name>/CURRENT            name of the active version
+    <CAREER_INDEX_DIR>/<name>/v1-<fingerprint>/  manifest.json, vocab.json, *.npy
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the array layout changes so old artifacts are ignored
+ARTIFACT_FORMAT = 1
+
+CURRENT_FILENAME = 'CURRENT'
+MANIFEST_FILENAME = 'manifest.json'
+VOCAB_FILENAME = 'vocab.json'
+
+
+def default_index_dir():
+    from django.conf import settings
+
+    return getattr(settings, 'CAREER_INDEX_DIR', None) if settings.configured else None
+
+
+def catalog_fingerprint(*parts):
+    """Stable hash of the catalog data an artifact was built from"""
+    payload = json.dumps([ARTIFACT_FORMAT, parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def csr_arrays(prefix, matrix):
+    matrix = matrix.tocsr()
+    return {
+        f'{prefix}.data': matrix.data,
+        f'{prefix}.indices': matrix.indices,
+        f'{prefix}.indptr': matrix.indptr,
+    }
+
+
+def write_atomic(path, text):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as tmp:
+        tmp.write(text)
+    os.replace(tmp_path, path)
+
+
+class CareerIndexArtifact:
+    """Read-only view of one artifact version; arrays are memory-mapped on access"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILENAME)) as fh:
+            self.manifest = json.load(fh)
+        with open(os.path.join(path, VOCAB_FILENAME)) as fh:
+            self.vocab = json.load(fh)
+
+    @property
+    def fingerprint(self):
+        return self.manifest['fingerprint']
+
+    def array(self, name):
+        return np.load(os.path.join(self.path, f'{name}.npy'), mmap_mode='r')
+
+    def csr(self, prefix):
+        shape = tuple(self.manifest['shapes'][prefix])
+        return sparse.csr_matrix(
+            (self.array(f'{prefix}.data'), self.array(f'{prefix}.indices'), self.array(f'{prefix}.indptr')),
+            shape=shape, copy=False
+        )
+
+    def file_path(self, filename):
+        return os.path.join(self.path, filename)
+
+
+def write_artifact(index_dir, name, fingerprint, arrays, vocab, shapes=None, files=None):
+    """Write a new artifact version and point CURRENT at it; returns its directory.
+
+    `files` maps extra file names to callables that write them given a path.
+    """
+    root = os.path.join(index_dir, name)
+    os.makedirs(root, exist_ok=True)
+    version = f'v{ARTIFACT_FORMAT}-{fingerprint[:16]}'
+    final_path = os.path.join(root, version)
+
+    tmp_path = tempfile.mkdtemp(dir=root, prefix=f'.{version}-')
+    try:
+        for array_name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f'{array_name}.npy'), np.ascontiguousarray(array))
+        for filename, writer in (files or {}).items():
+            writer(os.path.join(tmp_path, filename))
+        with open(os.path.join(tmp_path, VOCAB_FILENAME), 'w') as fh:
+            json.dump(vocab, fh)
+        with open(os.path.join(tmp_path, MANIFEST_FILENAME), 'w') as fh:
+            json.dump({
+                'format': ARTIFACT_FORMAT,
+                'name': name,
+                'fingerprint': fingerprint,
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'arrays': sorted(arrays),
+                'shapes': {key: list(shape) for key, shape in (shapes or {}).items()},
+            }, fh, indent=2)
+
+        if os.path.exists(final_path):
+            shutil.rmtree(final_path)
+        os.rename(tmp_path, final_path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    write_atomic(os.path.join(root, CURRENT_FILENAME), version)
+    return final_path
+
+
+def open_artifact(index_dir, name, fingerprint):
+    """Return the current artifact for `name` if it was built from `fingerprint`, else None"""
+    if not index_dir:
+        return None
+
+    root = os.path.join(index_dir, name)
+    try:
+        with open(os.path.join(root, CURRENT_FILENAME)) as fh:
+            version = fh.read().strip()
+        artifact = CareerIndexArtifact(os.path.join(root, version))
+    except (OSError, ValueError):
+        return None
+
+    if artifact.manifest.get('format') != ARTIFACT_FORMAT or artifact.fingerprint != fingerprint:
+        logger.warning("Career index artifact %s is stale, building in memory", artifact.path)
+        return None
+    return artifact
+
+
+def prune_artifacts(index_dir, name, keep=2):
+    """Delete all but the `keep` most recent versions, never the current one"""
+    root = os.path.join(index_dir, name)
+    try:
+        with open(os.path.join(root, CURRENT_FILENAME)) as fh:
+            current = fh.read().strip()
+    except OSError:
+        current = None
+
+    versions = sorted(
+        (entry for entry in os.scandir(root) if entry.is_dir() and entry.name.startswith('v')),
+        key=lambda entry: entry.stat().st_mtime, reverse=True
+    )
+    removed = []
+    for entry in versions[keep:]:
+        if entry.name != current:
+            shutil.rmtree(entry.path)
+            removed.append(entry.name)
+    return removed
@@ -0,0 +1,192 @@
+"""Career catalog stored in the database, served to the engines as an in-memory snapshot.
+
+The snapshot is rebuilt only when the CatalogVersion row changes, and that row
+is checked at most once every CAREER_CATALOG_CHECK_INTERVAL seconds, so
+scoring never queries the catalog tables per request.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+from core.routers import replica_alias
+
+from .models import Career, CareerSkill, CatalogVersion, PersonalityFit
+
+
+class CatalogSnapshot:
+    def __init__(self, version, careers):
+        self.version = version
+        self.careers = careers
+
+
+def career_to_dict(career, skills, personality_traits):
+    """Career row in the dict format the engines score"""
+    return {
+        'id': career['id'],
+        'title': career['title'],
+        'category': career['category'],
+        'skills': skills,
+        'personality_traits': personality_traits,
+        'education_required': career['education_required'],
+        'experience_level': career['experience_level'],
+        'salary_range': {
+            'min': career['salary_min'],
+            'max': career['salary_max'],
+            'median': career['salary_median'],
+        },
+        'job_growth': career['job_growth'],
+        'demand_score': career['demand_score'],
+        'remote_friendly': career['remote_friendly'],
+        'stress_level': career['stress_level'],
+        'description': career['description'],
+        'day_to_day': career['day_to_day'],
+        'companies': career['companies'],
+    }
+
+
+def read_catalog(using=None):
+    """Load every active career with three flat queries"""
+    careers = Career.objects.using(using).filter(is_active=True).order_by('id').values()
+
+    skills = defaultdict(list)
+    for career_id, name in (CareerSkill.objects.using(using)
+                            .filter(career__is_active=True)
+                            .order_by('career_id', 'order')
+                            .values_list('career_id', 'name')):
+        skills[career_id].append(name)
+
+    personality_traits = defaultdict(list)
+    for career_id, ptype in (PersonalityFit.objects.using(using)
+                             .filter(career__is_active=True)
+                             .order_by('career_id', 'order')
+                             .values_list('career_id', 'personality_type')):
+        personality_traits[career_id].append(ptype)
+
+    return [
+        career_to_dict(career, skills[career['id']], personality_traits[career['id']])
+        for career in careers
+    ]
+
+
+class DatabaseCatalog:
+    """Process-wide cache of the database catalog, keyed on CatalogVersion"""
+
+    def __init__(self, check_interval=None):
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def get_check_interval(self):
+        if self.check_interval is not None:
+            return self.check_interval
+        return getattr(settings, 'CAREER_CATALOG_CHECK_INTERVAL', 5)
+
+    def snapshot(self):
+        """Current catalog snapshot, or None while the catalog tables are empty"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.get_check_interval():
+            return self._snapshot
+
+        # Always the replica, even for pinned requests, so the snapshot never flips between
+        # the primary's version and a lagging replica's; the next check catches up
+        using = replica_alias()
+        with self._lock:
+            version = CatalogVersion.current(using)
+            if self._snapshot is None or self._snapshot.version != version:
+                careers = read_catalog(using)
+                self._snapshot = CatalogSnapshot(version, careers) if careers else None
+            self._checked_at = now
+        return self._snapshot
+
+    def invalidate(self):
+        """Force the next snapshot() call to re-check the version row"""
+        self._checked_at = None
+
+
+database_catalog = DatabaseCatalog()
+
+_bulk_load = threading.local()
+
+
+@contextmanager
+def bulk_catalog_changes():
+    """Suppress per-row version bumps; the caller bumps once when done"""
+    _bulk_load.active = True
+    try:
+        yield
+    finally:
+        _bulk_load.active = False
+
+
+def catalog_changed():
+    """Record a catalog edit so every process reloads its snapshot"""
+    if getattr(_bulk_load, 'active', False):
+        return
+    CatalogVersion.bump()
+    database_catalog.invalidate()
+
+
+def load_catalog(careers, replace=False):
+    """Bulk upsert career dicts (engine format) keyed on title; returns (created, updated)"""
+    fields = [
+        'category', 'description', 'education_required', 'experience_level',
+        'salary_min', 'salary_max', 'salary_median', 'job_growth', 'demand_score',
+        'remote_friendly', 'stress_level', 'day_to_day', 'companies', 'is_active',
+    ]
+
+    with transaction.atomic(), bulk_catalog_changes():
+        if replace:
+            Career.objects.all().delete()
+        existing = Career.objects.in_bulk([career['title'] for career in careers], field_name='title')
+
+        to_create, to_update = [], []
+        for data in careers:
+            salary = data.get('salary_range') or {}
+            values = {
+                'category': data.get('category', ''),
+                'description': data.get('description', ''),
+                'education_required': data.get('education_required', ''),
+                'experience_level': data.get('experience_level', ''),
+                'salary_min': salary.get('min'),
+                'salary_max': salary.get('max'),
+                'salary_median': salary.get('median'),
+                'job_growth': data.get('job_growth', 0),
+                'demand_score': data.get('demand_score', 0),
+                'remote_friendly': data.get('remote_friendly', False),
+                'stress_level': data.get('stress_level', ''),
+                'day_to_day': data.get('day_to_day', []),
+                'companies': data.get('companies', []),
+                'is_active': True,
+            }
+            career = existing.get(data['title'])
+            if career is None:
+                to_create.append(Career(title=data['title'], **values))
+            else:
+                for field, value in values.items():
+                    setattr(career, field, value)
+                to_update.append(career)
+
+        Career.objects.bulk_create(to_create, batch_size=500)
+        Career.objects.bulk_update(to_update, fields, batch_size=500)
+
+        by_title = {career.title: career for career in to_create + to_update}
+        CareerSkill.objects.filter(career__in=to_update).delete()
+        PersonalityFit.objects.filter(career__in=to_update).delete()
+        CareerSkill.objects.bulk_create([
+            CareerSkill(career=by_title[data['title']], name=name, order=order)
+            for data in careers
+            for order, name in enumerate(data.get('skills', []))
+        ], batch_size=1000)
+        PersonalityFit.objects.bulk_create([
+            PersonalityFit(career=by_title[data['title']], personality_type=ptype, order=order)
+            for data in careers
+            for order, ptype in enumerate(data.get('personality_traits', []))
+        ], batch_size=1000)
+
+    catalog_changed()
+    return len(to_create), len(to_update)
@@ -0,0 +1,85 @@
+"""Recommendation engine backends and the process-wide shared engine.
+
+Backends are factories registered under a name; RECOMMENDATION_ENGINE_BACKEND
+picks the one a deployment serves, and every backend scores with the same
+catalog and RECOMMENDATION_SCORERS weights.
+
+Importing this module is cheap: the engine modules, and with them NumPy,
+SciPy and scikit-learn, are only imported when an engine is first built,
+so management commands, migrations and URLconf loading don't pay for them.
+"""
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+_backends = {}
+_engines = {}
+_lock = threading.Lock()
+
+
+def register_backend(name):
+    """Register an engine factory under `name`; factories take AdvancedCareerAI keyword arguments"""
+    def register(factory):
+        _backends[name] = factory
+        return factory
+    return register
+
+
+@register_backend('matrix')
+def build_matrix_engine(**options):
+    """Scores every career at once from precomputed feature arrays"""
+    from .ai_engine import AdvancedCareerAI
+
+    return AdvancedCareerAI(scoring_mode='matrix', **options)
+
+
+@register_backend('loop')
+def build_loop_engine(**options):
+    """Scores careers one at a time; no feature arrays to build or keep in memory"""
+    from .ai_engine import AdvancedCareerAI
+
+    return AdvancedCareerAI(scoring_mode='loop', **options)
+
+
+def backend_names():
+    return list(_backends)
+
+
+def build_engine(backend=None, **options):
+    """New engine of `backend`, RECOMMENDATION_ENGINE_BACKEND by default"""
+    backend = backend or settings.RECOMMENDATION_ENGINE_BACKEND
+    factory = _backends.get(backend)
+    if factory is None:
+        raise ImproperlyConfigured(
+            f"Unknown recommendation engine backend {backend!r}; choose from {', '.join(_backends)}"
+        )
+    return factory(**options)
+
+
+def get_engine(name, factory):
+    """Return the shared engine registered under `name`, building it with `factory` once"""
+    engine = _engines.get(name)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(name)
+            if engine is None:
+                engine = _engines[name] = factory()
+    return engine
+
+
+def build_career_ai():
+    from .catalog import database_catalog
+
+    return build_engine(catalog=database_catalog)
+
+
+def get_career_ai():
+    """Shared engine of the configured backend, backed by the database catalog"""
+    return get_engine('career_ai', build_career_ai)
+
+
+def reset_engines():
+    """Drop the shared instances so the next request rebuilds them"""
+    with _lock:
+        _engines.clear()
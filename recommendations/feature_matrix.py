@@ -0,0 +1,90 @@
+import numpy as np
+
+from .scorers import weighted_total
+from .skill_index import SkillIndex
+
+
+# Upper bound on users x careers cells scored per batch chunk
+BATCH_CELLS = 1_000_000
+
+
+class CareerFeatureMatrix:
+    """Career catalog laid out as arrays so a user is scored against every career at once.
+
+    Each of the engine's scorers precomputes its per-career arrays here and
+    reproduces the float arithmetic of its per-career form, so rankings are
+    identical to the loop-based scorer.
+    """
+
+    def __init__(self, engine, careers):
+        self.careers = careers
+        self.size = len(careers)
+        self.scorers = engine.scorers
+        self.personality_types = engine.personality_types
+        self.personality_index = engine.personality_index
+
+        self.skills = SkillIndex([career['skills'] for career in careers])
+        for scorer in self.scorers:
+            for name, array in scorer.build_arrays(engine, careers).items():
+                setattr(self, name, array)
+
+    @classmethod
+    def from_artifact(cls, engine, careers, artifact):
+        """Wrap memory-mapped arrays from a career index artifact instead of rebuilding them"""
+        matrix = cls.__new__(cls)
+        matrix.careers = careers
+        matrix.size = len(careers)
+        matrix.scorers = engine.scorers
+        matrix.personality_types = engine.personality_types
+        matrix.personality_index = engine.personality_index
+        for name in matrix.array_names():
+            setattr(matrix, name, artifact.array(name))
+        matrix.skills = SkillIndex.from_artifact([career['skills'] for career in careers], artifact)
+        return matrix
+
+    def array_names(self):
+        """Dense per-career arrays persisted in career index artifacts"""
+        return [name for scorer in self.scorers for name in scorer.array_names]
+
+    def to_arrays(self):
+        """Return (arrays, vocab, shapes) for writing this matrix into an artifact"""
+        arrays, vocab, shapes = self.skills.to_arrays()
+        arrays.update({name: getattr(self, name) for name in self.array_names()})
+        return arrays, vocab, shapes
+
+    def personality_column(self, user_personality):
+        col = self.personality_index.get(user_personality) if user_personality else None
+        return len(self.personality_types) if col is None else col
+
+    def chunk_size(self):
+        """Number of users per batch chunk that keeps score matrices within BATCH_CELLS"""
+        return max(1, BATCH_CELLS // max(self.size, 1))
+
+    def score_batch(self, users, skill_matches):
+        """Return (total, component scores) as users x careers matrices, components in scorer order"""
+        components = [scorer.score_batch(self, users, skill_matches) for scorer in self.scorers]
+        return weighted_total(self.scorers, components), components
+
+    def top_k(self, totals, k):
+        """Per-row indices of the k best careers, ordered like the loop scorer's stable sort"""
+        # Integer keys fold the catalog-order tie break into the score, so
+        # argpartition selects exactly the careers a stable full sort would keep
+        match_scores = np.rint(round_scores(totals * 100, 1) * 10).astype(np.int64)
+        keys = np.arange(self.size) - match_scores * self.size
+
+        k = min(k, self.size)
+        if k < self.size:
+            candidates = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(self.size), keys.shape)
+        order = np.argsort(np.take_along_axis(keys, candidates, axis=1), axis=1)
+        return np.take_along_axis(candidates, order, axis=1)
+
+
+def round_scores(values, ndigits):
+    """np.round that agrees with Python's round() on values sitting near a half step"""
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    for index in zip(*np.nonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)):
+        rounded[index] = round(float(values[index]), ndigits)
+    return rounded
@@ -0,0 +1,125 @@
+"""Database-backed queue for recommendation runs.
+
+Requests enqueue a RecommendationJob row and return immediately;
+``manage.py run_recommendation_worker`` claims pending jobs, scores them and
+rewrites the user's materialized recommendations.
+A claim is a conditional UPDATE from pending to running, so any number of
+workers can share the queue on any database without row locks.
+"""
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import RecommendationJob
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+# Recommendations stored on a job for the assessment result page
+JOB_RESULTS = 10
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def enqueue_recommendations(user, user_data, result=None):
+    """Queue a recommendation run; returns the job the result page polls"""
+    return RecommendationJob.objects.create(user=user, result=result, user_data=user_data)
+
+
+def enqueue_refresh(user_id):
+    """Queue a rewrite of the user's materialized recommendations unless one is already pending"""
+    # Every job refreshes the rows, so a pending one of any kind already covers this
+    if not RecommendationJob.objects.filter(user_id=user_id, status=RecommendationJob.PENDING).exists():
+        RecommendationJob.objects.create(user_id=user_id)
+
+
+def enqueue_refreshes(user_ids):
+    """enqueue_refresh() for many users in two queries; returns how many jobs were queued"""
+    pending = set(RecommendationJob.objects.filter(
+        user_id__in=user_ids, status=RecommendationJob.PENDING
+    ).values_list('user_id', flat=True))
+    jobs = RecommendationJob.objects.bulk_create([
+        RecommendationJob(user_id=user_id) for user_id in set(user_ids) - pending
+    ])
+    return len(jobs)
+
+
+def claim_next_job(worker):
+    """Mark the oldest pending job as running for `worker`; None when the queue is empty"""
+    while True:
+        job_id = (RecommendationJob.objects.filter(status=RecommendationJob.PENDING)
+                  .order_by('id').values_list('id', flat=True).first())
+        if job_id is None:
+            return None
+
+        claimed = RecommendationJob.objects.filter(id=job_id, status=RecommendationJob.PENDING).update(
+            status=RecommendationJob.RUNNING, worker=worker, started_at=timezone.now(),
+            attempts=F('attempts') + 1
+        )
+        # Another worker won the race for this job; try the next one
+        if claimed:
+            return RecommendationJob.objects.get(id=job_id)
+
+
+def run_job(job, engine=None):
+    """Score a claimed job and store the outcome; failures are retried up to MAX_ATTEMPTS.
+
+    Every job refreshes the user's materialized recommendations; jobs with
+    user_data, queued by assessment submissions, also store the top
+    JOB_RESULTS for the result page.
+    """
+    from .materialize import TOP_N, refresh_user_recommendations
+    from .result_cache import build_user_data, get_recommendations
+
+    if engine is None:
+        from .engines import get_career_ai
+        engine = get_career_ai()
+
+    try:
+        refresh_user_recommendations(job.user, engine=engine)
+        if job.user_data:
+            # The head of the ranking just materialized, from the result cache: the result
+            # page matches the dashboard and the user isn't scored twice
+            job.recommendations = get_recommendations(
+                job.user_id, build_user_data(job.user), TOP_N, engine
+            )[:JOB_RESULTS]
+    except Exception as exc:
+        logger.exception("Recommendation job %s failed", job.id)
+        job.error = f'{type(exc).__name__}: {exc}'
+        job.status = RecommendationJob.PENDING if job.attempts < MAX_ATTEMPTS else RecommendationJob.FAILED
+    else:
+        job.error = ''
+        job.status = RecommendationJob.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=['recommendations', 'error', 'status', 'finished_at'])
+    return job
+
+
+def requeue_stale_jobs(timeout):
+    """Return jobs left running by a dead worker to the queue; returns how many were requeued"""
+    stale = RecommendationJob.objects.filter(
+        status=RecommendationJob.RUNNING, started_at__lt=timezone.now() - timedelta(seconds=timeout)
+    )
+    # A job that keeps killing its worker is given up on like one that keeps raising
+    stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=RecommendationJob.FAILED, error='Worker stopped while running the job',
+        finished_at=timezone.now()
+    )
+    return stale.update(status=RecommendationJob.PENDING, worker='')
+
+
+def job_payload(job):
+    """JSON the result page polls"""
+    return {
+        'id': job.id,
+        'status': job.status,
+        'recommendations': job.recommendations if job.status == RecommendationJob.DONE else [],
+        'error': job.error if job.status == RecommendationJob.FAILED else '',
+    }
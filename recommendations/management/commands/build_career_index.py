@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recommendations.artifacts import prune_artifacts
+from recommendations.catalog import database_catalog
+from recommendations.engines import build_engine
+
+
+class Command(BaseCommand):
+    help = 'Build the versioned career index artifacts that engines memory-map at startup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir', default=None,
+            help='Directory to write artifacts to (defaults to CAREER_INDEX_DIR)'
+        )
+        parser.add_argument(
+            '--keep', type=int, default=2,
+            help='Number of artifact versions to keep (default: 2)'
+        )
+
+    def handle(self, *args, **options):
+        index_dir = options['output_dir'] or settings.CAREER_INDEX_DIR
+
+        engine = build_engine(index_dir=index_dir, catalog=database_catalog)
+        engine.sync_catalog()
+        started = time.perf_counter()
+        path = engine.write_career_index(index_dir)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Wrote {path} in {elapsed * 1000:.1f} ms'))
+
+        for version in prune_artifacts(index_dir, engine.ARTIFACT_NAME, keep=options['keep']):
+            self.stdout.write(f'Removed old artifact {version}')
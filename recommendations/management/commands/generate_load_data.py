@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from assessments.models import Assessment, AssessmentResult, Choice, Question
+from recommendations.catalog import read_catalog
+from recommendations.materialize import CAREER_DETAIL_FIELDS
+from recommendations.models import CareerRecommendation
+from recommendations.synthetic import assessment_questions, generate_range, init_worker, init_writer
+from users.models import StudentProfile
+
+User = get_user_model()
+
+# Written in this order so foreign keys always point at existing rows
+TABLES = [
+    ('users', User),
+    ('profiles', StudentProfile),
+    ('results', AssessmentResult),
+    ('recommendations', CareerRecommendation),
+]
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+
+def write_rows(rows):
+    """Bulk create one range of users in a single transaction; returns the rows written per table"""
+    with transaction.atomic():
+        for name, model in TABLES:
+            model.objects.bulk_create([model(**fields) for fields in rows[name]])
+    return {name: len(rows[name]) for name, _ in TABLES}
+
+
+def write_range(start, stop):
+    """Worker task: generate a range of users and write it over the worker's own connection"""
+    return write_rows(generate_range(start, stop))
+
+
+class Command(BaseCommand):
+    help = 'Bulk create synthetic students, assessments, answers and recommendations for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Students to create (default: 1000)')
+        parser.add_argument(
+            '--assessments', type=int, default=3,
+            help='Assessments to create; each student completes most of them (default: 3)'
+        )
+        parser.add_argument('--questions', type=int, default=40, help='Questions per assessment (default: 40)')
+        parser.add_argument(
+            '--recommendations', type=int, default=10,
+            help='Materialized recommendations per student (default: 10)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Students generated and written per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Generating processes; 1 generates in this process (default: CPU count)'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed; equal seeds create equal data (default: 0)')
+        parser.add_argument('--prefix', default='loadtest', help='Username prefix (default: loadtest)')
+        parser.add_argument('--password', default='loadtest123', help='Password of every student')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f'Users named {prefix}* already exist; pass another --prefix')
+
+        careers = read_catalog()
+        if not careers:
+            from recommendations.ai_engine import AdvancedCareerAI
+            careers = AdvancedCareerAI().load_career_database()
+
+        started = time.perf_counter()
+        context = {
+            'seed': options['seed'],
+            'prefix': prefix,
+            # One hash for everyone: hashing per user would take longer than the whole run
+            'password': make_password(options['password']),
+            'recommendations': options['recommendations'],
+            'assessments': self.create_assessments(options['assessments'], options['questions']),
+            'careers': [
+                {
+                    'title': career['title'], 'category': career['category'], 'skills': career['skills'],
+                    'details': {field: career[field] for field in CAREER_DETAIL_FIELDS},
+                }
+                for career in careers
+            ],
+            'first_ids': {name: next_id(model) for name, model in TABLES},
+        }
+
+        users, batch_size = options['users'], options['batch_size']
+        ranges = [(start, min(start + batch_size, users)) for start in range(0, users, batch_size)]
+        written = dict.fromkeys(context['first_ids'], 0)
+
+        def record(counts):
+            for name, count in counts.items():
+                written[name] += count
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{written['users']} of {users} students written ({written['users'] / elapsed:,.0f} students/s)"
+            )
+
+        workers = max(1, options['workers'])
+        if workers == 1:
+            init_worker(context)
+            for start, stop in ranges:
+                record(write_rows(generate_range(start, stop)))
+        else:
+            # Workers are spawned, not forked, so they never inherit this process's connection.
+            # SQLite takes one writer at a time, so there the workers only generate rows and
+            # this process writes them; elsewhere each worker also writes its own ranges.
+            parallel_writes = connection.vendor != 'sqlite'
+            mp_context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=mp_context,
+                initializer=init_writer if parallel_writes else init_worker, initargs=(context,)
+            ) as pool:
+                task = write_range if parallel_writes else generate_range
+                finish = (lambda counts: counts) if parallel_writes else write_rows
+                # At most two ranges per worker in flight to bound memory
+                pending = deque()
+                for start, stop in ranges:
+                    pending.append(pool.submit(task, start, stop))
+                    if len(pending) >= 2 * workers:
+                        record(finish(pending.popleft().result()))
+                while pending:
+                    record(finish(pending.popleft().result()))
+
+        self.reset_sequences()
+        elapsed = time.perf_counter() - started
+        rows = sum(written.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {rows:,} rows in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/s): '
+            + ', '.join(f'{count:,} {name}' for name, count in written.items())
+        ))
+
+    def create_assessments(self, count, question_count):
+        """Save the assessments; returns (id, questions) pairs in the shape generate_users() expects"""
+        first_ids = {model: next_id(model) for model in (Assessment, Question, Choice)}
+        assessments, questions, choices, created = [], [], [], []
+        template = assessment_questions(question_count)
+        for position in range(count):
+            assessment_id = first_ids[Assessment] + position
+            assessments.append(Assessment(
+                id=assessment_id, title=f'Load test assessment {position + 1}',
+                description='Synthetic personality assessment', assessment_type='personality',
+                questions_count=question_count, time_required=max(1, question_count // 4)
+            ))
+            saved_questions = []
+            for order, (text, question_choices) in enumerate(template):
+                question_id = first_ids[Question] + len(questions)
+                questions.append(Question(id=question_id, assessment_id=assessment_id, text=text, order=order))
+                saved_choices = []
+                for value, choice_text in question_choices:
+                    choice_id = first_ids[Choice] + len(choices)
+                    choices.append(Choice(
+                        id=choice_id, question_id=question_id, text=choice_text, value=value, weight=1.0
+                    ))
+                    saved_choices.append((choice_id, value, 1.0, choice_text))
+                saved_questions.append((question_id, text, saved_choices))
+            created.append((assessment_id, saved_questions))
+
+        with transaction.atomic():
+            Assessment.objects.bulk_create(assessments)
+            Question.objects.bulk_create(questions)
+            Choice.objects.bulk_create(choices)
+        return created
+
+    def reset_sequences(self):
+        """Move the id sequences past the explicit ids; a no-op on SQLite"""
+        models = [model for _, model in TABLES] + [Assessment, Question, Choice]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
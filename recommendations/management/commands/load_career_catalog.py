@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from recommendations.ai_engine import AdvancedCareerAI
+from recommendations.catalog import load_catalog
+
+
+class Command(BaseCommand):
+    help = 'Bulk load the career catalog into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file', default=None,
+            help='JSON list of careers in the engine format (defaults to the built-in catalog)'
+        )
+        parser.add_argument(
+            '--replace', action='store_true',
+            help='Delete every existing career before loading'
+        )
+
+    def handle(self, *args, **options):
+        if options['file']:
+            with open(options['file']) as fh:
+                careers = json.load(fh)
+        else:
+            careers = AdvancedCareerAI().load_career_database()
+
+        created, updated = load_catalog(careers, replace=options['replace'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {len(careers)} careers ({created} created, {updated} updated)'
+        ))
@@ -0,0 +1,82 @@
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from recommendations.engines import get_career_ai
+from recommendations.materialize import TOP_N, materialize_recommendations
+from recommendations.models import CareerRecommendation
+from recommendations.result_cache import (
+    build_user_data, catalog_key, latest_personality_type_subquery, profile_fingerprint
+)
+
+
+class Command(BaseCommand):
+    help = "Rewrite every user's materialized top-N career recommendations"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Users scored together as one matrix (default: 500)'
+        )
+        parser.add_argument(
+            '--top-n', type=int, default=TOP_N,
+            help=f'Recommendations kept per user (default: {TOP_N})'
+        )
+        parser.add_argument(
+            '--user', type=int, action='append', dest='user_ids',
+            help='Only materialize this user id; repeat for several users'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Rewrite users whose rows already match their profile and the catalog'
+        )
+
+    def handle(self, *args, **options):
+        top_n = options['top_n']
+        engine = get_career_ai()
+        engine.sync_catalog()
+        catalog = catalog_key(engine)
+
+        users = (get_user_model().objects.filter(is_active=True)
+                 .select_related('studentprofile')
+                 .annotate(latest_personality_type=latest_personality_type_subquery())
+                 .order_by('id'))
+        if options['user_ids']:
+            users = users.filter(id__in=options['user_ids'])
+        users = users.iterator(chunk_size=options['batch_size'])
+
+        started = time.perf_counter()
+        processed = written = 0
+        while True:
+            batch = list(islice(users, options['batch_size']))
+            if not batch:
+                break
+
+            user_data = [build_user_data(user) for user in batch]
+            fingerprints = [profile_fingerprint(data, catalog, top_n) for data in user_data]
+            current = set()
+            if not options['force']:
+                current = set(CareerRecommendation.objects.filter(
+                    user__in=batch, rank=1, fingerprint__in=fingerprints
+                ).values_list('user_id', 'fingerprint'))
+
+            stale = [index for index, user in enumerate(batch)
+                     if (user.id, fingerprints[index]) not in current]
+            ranked = engine.generate_batch_recommendations(
+                (user_data[index] for index in stale), top_n
+            )
+            for index, recommendations in zip(stale, ranked):
+                materialize_recommendations(batch[index], recommendations, fingerprints[index])
+
+            processed += len(batch)
+            written += len(stale)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{processed} users checked, {written} rewritten ({processed / elapsed:,.0f} users/s)'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Materialized recommendations for {written} of {processed} users'
+        ))
@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from recommendations.engines import get_career_ai
+from recommendations.jobs import claim_next_job, requeue_stale_jobs, run_job, worker_name
+
+
+class Command(BaseCommand):
+    help = 'Process queued recommendation jobs from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.RECOMMENDATION_WORKER_POLL_INTERVAL,
+            help='Seconds to sleep when the queue is empty (default: RECOMMENDATION_WORKER_POLL_INTERVAL)'
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=300,
+            help='Requeue jobs another worker has been running for this many seconds (default: 300)'
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once the queue is empty instead of waiting for new jobs'
+        )
+        parser.add_argument(
+            '--max-jobs', type=int, default=None,
+            help='Exit after processing this many jobs'
+        )
+
+    def handle(self, *args, **options):
+        worker = worker_name()
+        # Build the engine once, before the first job, so no job pays for it
+        engine = get_career_ai()
+        engine.sync_catalog()
+        self.stdout.write(f'Recommendation worker {worker} started')
+
+        processed = 0
+        last_requeue = None
+        while options['max_jobs'] is None or processed < options['max_jobs']:
+            close_old_connections()
+
+            now = time.monotonic()
+            if last_requeue is None or now - last_requeue >= options['stale_after']:
+                requeued = requeue_stale_jobs(options['stale_after'])
+                if requeued:
+                    self.stdout.write(f'Requeued {requeued} stale jobs')
+                last_requeue = now
+
+            job = claim_next_job(worker)
+            if job is None:
+                if options['burst']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            started = time.perf_counter()
+            job = run_job(job, engine)
+            processed += 1
+            self.stdout.write(
+                f'Job {job.id} {job.status} in {(time.perf_counter() - started) * 1000:.1f} ms'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} jobs'))
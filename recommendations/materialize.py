@@ -0,0 +1,133 @@
+"""Materialized top-N recommendations per user.
+
+Each user's ranked recommendations are written to CareerRecommendation rows
+so the dashboard, career paths and skill gap pages read them with a single
+indexed query instead of scoring the catalog on every page view. Rows are
+rewritten by the recommendation worker, by ``manage.py
+materialize_recommendations`` and, for a user without any rows yet, on their
+first dashboard visit. Each row carries the fingerprint of the inputs,
+catalog version and scorers it was ranked from; a page that reads rows with
+an outdated fingerprint queues a refresh, so catalog edits and
+RECOMMENDATION_SCORERS changes reach every user on their next visit.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from core.routers import use_primary
+
+from .jobs import enqueue_refresh
+from .models import CareerRecommendation
+from .result_cache import build_user_data, catalog_key, get_recommendations, profile_fingerprint
+
+TOP_N = 20
+
+# Columns rewritten on every refresh; is_favorite and feedback_score belong to the user
+MATERIALIZED_FIELDS = [
+    'category', 'rank', 'match_score', 'detailed_scores', 'missing_skills',
+    'learning_path', 'career_details', 'fingerprint', 'updated_at',
+]
+
+CAREER_DETAIL_FIELDS = [
+    'description', 'salary_range', 'job_growth', 'demand_score', 'remote_friendly',
+    'experience_level', 'companies', 'day_to_day',
+]
+
+
+def ranked_recommendations(user):
+    """The user's materialized top-N, best match first"""
+    return CareerRecommendation.objects.filter(user=user, rank__isnull=False).order_by('rank')
+
+
+def materialized_key(user_id, rows):
+    """Names cached fragments rendered from exactly these rows"""
+    if not rows:
+        return f'{user_id}:empty'
+    updated = max(row.updated_at for row in rows)
+    return f'{user_id}:{rows[0].fingerprint}:{updated.timestamp()}'
+
+
+def materialize_recommendations(user, recommendations, fingerprint=''):
+    """Replace the user's ranked rows with `recommendations` in one transaction.
+
+    Careers that drop out of the list are deleted, unless the user starred or
+    rated them; those are kept without a rank so the feedback survives.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {
+            row.career_title: row
+            for row in CareerRecommendation.objects.select_for_update().filter(user=user)
+        }
+
+        created, updated = [], []
+        for rank, recommendation in enumerate(recommendations, 1):
+            row = existing.pop(recommendation['career'], None)
+            if row is None:
+                row = CareerRecommendation(user=user, career_title=recommendation['career'])
+                created.append(row)
+            else:
+                updated.append(row)
+            row.category = recommendation['category']
+            row.rank = rank
+            row.match_score = recommendation['match_score']
+            row.detailed_scores = recommendation['detailed_scores']
+            row.missing_skills = recommendation['missing_skills']
+            row.learning_path = recommendation['learning_path']
+            row.career_details = {field: recommendation[field] for field in CAREER_DETAIL_FIELDS}
+            row.fingerprint = fingerprint
+            row.updated_at = now
+
+        if created:
+            # A concurrent refresh for the same user may insert the same careers first
+            CareerRecommendation.objects.bulk_create(
+                created, update_conflicts=True, unique_fields=['user', 'career_title'],
+                update_fields=MATERIALIZED_FIELDS
+            )
+        if updated:
+            CareerRecommendation.objects.bulk_update(updated, MATERIALIZED_FIELDS)
+
+        if existing:
+            dropped = [row.id for row in existing.values()]
+            kept = [row.id for row in existing.values()
+                    if row.is_favorite or row.feedback_score is not None]
+            CareerRecommendation.objects.filter(id__in=kept).update(rank=None, updated_at=now)
+            CareerRecommendation.objects.filter(id__in=dropped).exclude(id__in=kept).delete()
+
+
+def current_fingerprint(user, engine, top_n=TOP_N):
+    """Fingerprint of the rows the user's current inputs, catalog and scorers would materialize"""
+    engine.sync_catalog()
+    return profile_fingerprint(build_user_data(user), catalog_key(engine), top_n)
+
+
+def refresh_if_outdated(user, fingerprint, engine=None):
+    """Queue a rewrite of rows materialized under `fingerprint` if it is outdated; returns whether one was queued"""
+    if engine is None:
+        from .engines import get_career_ai
+        engine = get_career_ai()
+    if fingerprint == current_fingerprint(user, engine):
+        return False
+    with use_primary():
+        enqueue_refresh(user.id)
+    return True
+
+
+def refresh_user_recommendations(user, top_n=TOP_N, engine=None, force=False):
+    """Score the user and materialize the result; returns False when the rows were already current"""
+    if engine is None:
+        from .engines import get_career_ai
+        engine = get_career_ai()
+    engine.sync_catalog()
+
+    # Compared against and rewritten on the primary, never a lagging replica
+    with use_primary():
+        user_data = build_user_data(user)
+        fingerprint = profile_fingerprint(user_data, catalog_key(engine), top_n)
+        if not force and CareerRecommendation.objects.filter(
+                user=user, rank=1, fingerprint=fingerprint).exists():
+            return False
+
+        materialize_recommendations(
+            user, get_recommendations(user.id, user_data, top_n, engine), fingerprint
+        )
+    return True
@@ -0,0 +1,90 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Career',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, unique=True)),
+                ('category', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('education_required', models.CharField(blank=True, max_length=200)),
+                ('experience_level', models.CharField(blank=True, max_length=100)),
+                ('salary_min', models.IntegerField(blank=True, null=True)),
+                ('salary_max', models.IntegerField(blank=True, null=True)),
+                ('salary_median', models.IntegerField(blank=True, null=True)),
+                ('job_growth', models.FloatField(default=0)),
+                ('demand_score', models.IntegerField(default=0)),
+                ('remote_friendly', models.BooleanField(default=False)),
+                ('stress_level', models.CharField(blank=True, max_length=50)),
+                ('day_to_day', models.JSONField(blank=True, default=list)),
+                ('companies', models.JSONField(blank=True, default=list)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PersonalityFit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('personality_type', models.CharField(max_length=4)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('career', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='personality_fits', to='recommendations.career')),
+            ],
+            options={
+                'ordering': ['career', 'order'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CareerSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('career', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skills', to='recommendations.career')),
+            ],
+            options={
+                'ordering': ['career', 'order'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='career',
+            index=models.Index(fields=['is_active', 'category'], name='career_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personalityfit',
+            index=models.Index(fields=['personality_type'], name='personalityfit_type_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='personalityfit',
+            unique_together={('career', 'order')},
+        ),
+        migrations.AddIndex(
+            model_name='careerskill',
+            index=models.Index(fields=['name'], name='careerskill_name_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='careerskill',
+            unique_together={('career', 'order')},
+        ),
+    ]
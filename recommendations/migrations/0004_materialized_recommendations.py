@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recommendations', '0003_recommendation_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='careerrecommendation',
+            name='career_details',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='careerrecommendation',
+            name='category',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='careerrecommendation',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='careerrecommendation',
+            name='rank',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='careerrecommendation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name='careerrecommendation',
+            unique_together={('user', 'career_title')},
+        ),
+        migrations.AddIndex(
+            model_name='careerrecommendation',
+            index=models.Index(fields=['user', 'rank'], name='careerrec_user_rank_idx'),
+        ),
+    ]
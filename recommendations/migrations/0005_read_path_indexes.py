@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0004_materialized_recommendations'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='careerrecommendation',
+            index=models.Index(fields=['user', '-match_score'], name='careerrec_user_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='careerrecommendation',
+            index=models.Index(condition=models.Q(('is_favorite', True)), fields=['user', '-match_score'], name='careerrec_user_fav_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learningpath',
+            index=models.Index(fields=['user', 'career_target'], name='learnpath_user_target_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillgapanalysis',
+            index=models.Index(fields=['user', 'target_career'], name='skillgap_user_target_idx'),
+        ),
+    ]
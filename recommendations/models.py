@@ -6,16 +6,29 @@ User = get_user_model()
 class CareerRecommendation(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='career_recommendations')
     career_title = models.CharField(max_length=200)
+    category = models.CharField(max_length=100, blank=True)
+    rank = models.PositiveIntegerField(null=True, blank=True)  # None once it drops out of the top-N
     match_score = models.FloatField()
     detailed_scores = models.JSONField(default=dict)
     missing_skills = models.JSONField(default=list)
     learning_path = models.JSONField(default=dict)
+    career_details = models.JSONField(default=dict)  # Catalog fields the pages display
+    fingerprint = models.CharField(max_length=64, blank=True)  # Profile fingerprint it was scored from
     generated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_favorite = models.BooleanField(default=False)
     feedback_score = models.IntegerField(null=True, blank=True)  # 1-5 rating
     
     class Meta:
         ordering = ['-match_score']
+        unique_together = ['user', 'career_title']
+        indexes = [
+            models.Index(fields=['user', 'rank'], name='careerrec_user_rank_idx'),
+            models.Index(fields=['user', '-match_score'], name='careerrec_user_score_idx'),
+            # Partial: only starred rows, and a bare boolean WHERE can't seek a column index
+            models.Index(fields=['user', '-match_score'], condition=models.Q(is_favorite=True),
+                         name='careerrec_user_fav_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.career_title} ({self.match_score}%)"
@@ -30,6 +43,11 @@ class SkillGapAnalysis(models.Model):
     progress_percentage = models.FloatField(default=0.0)
     last_updated = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'target_career'], name='skillgap_user_target_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.target_career} Skill Gap"
 
@@ -43,6 +61,11 @@ class LearningPath(models.Model):
     estimated_completion = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'career_target'], name='learnpath_user_target_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.career_target} Learning Path"
 
@@ -55,4 +78,116 @@ class IndustryTrend(models.Model):
     last_updated = models.DateTimeField(auto_now=True)
     
     def __str__(self):
-        return f"{self.industry} Trends"
\ No newline at end of file
+        return f"{self.industry} Trends"
+
+class Career(models.Model):
+    title = models.CharField(max_length=200, unique=True)
+    category = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    education_required = models.CharField(max_length=200, blank=True)
+    experience_level = models.CharField(max_length=100, blank=True)
+    salary_min = models.IntegerField(null=True, blank=True)
+    salary_max = models.IntegerField(null=True, blank=True)
+    salary_median = models.IntegerField(null=True, blank=True)
+    job_growth = models.FloatField(default=0)
+    demand_score = models.IntegerField(default=0)
+    remote_friendly = models.BooleanField(default=False)
+    stress_level = models.CharField(max_length=50, blank=True)
+    day_to_day = models.JSONField(default=list, blank=True)
+    companies = models.JSONField(default=list, blank=True)
+    is_active = models.BooleanField(default=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['is_active', 'category'], name='career_active_category_idx'),
+        ]
+    
+    def __str__(self):
+        return self.title
+
+class CareerSkill(models.Model):
+    career = models.ForeignKey(Career, on_delete=models.CASCADE, related_name='skills')
+    name = models.CharField(max_length=100)
+    order = models.PositiveIntegerField(default=0)  # Most important skills first
+    
+    class Meta:
+        ordering = ['career', 'order']
+        unique_together = ['career', 'order']
+        indexes = [
+            models.Index(fields=['name'], name='careerskill_name_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.career.title} - {self.name}"
+
+class PersonalityFit(models.Model):
+    career = models.ForeignKey(Career, on_delete=models.CASCADE, related_name='personality_fits')
+    personality_type = models.CharField(max_length=4)
+    order = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['career', 'order']
+        unique_together = ['career', 'order']
+        indexes = [
+            models.Index(fields=['personality_type'], name='personalityfit_type_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.career.title} - {self.personality_type}"
+
+class CatalogVersion(models.Model):
+    """Single row bumped on every catalog change; engines reload their snapshot when it moves"""
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Catalog v{self.version}"
+    
+    @classmethod
+    def current(cls, using=None):
+        return cls.objects.using(using).filter(pk=1).values_list('version', flat=True).first() or 0
+    
+    @classmethod
+    def bump(cls):
+        if not cls.objects.filter(pk=1).update(version=models.F('version') + 1):
+            _, created = cls.objects.get_or_create(pk=1, defaults={'version': 1})
+            if not created:
+                cls.objects.filter(pk=1).update(version=models.F('version') + 1)
+
+class RecommendationJob(models.Model):
+    """Queued recommendation run for a saved assessment result; processed by run_recommendation_worker"""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recommendation_jobs')
+    result = models.ForeignKey(
+        'assessments.AssessmentResult', on_delete=models.CASCADE,
+        null=True, blank=True, related_name='recommendation_jobs'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    user_data = models.JSONField(default=dict)
+    recommendations = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='recjob_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Recommendation job {self.id} ({self.status})"
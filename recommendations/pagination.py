@@ -0,0 +1,63 @@
+"""Keyset pagination over a user's materialized recommendations.
+
+Pages are ordered by (-match_score, id), the order of the (user, -match_score)
+index, and a cursor holds the sort key of the last row a page returned. The
+next page seeks straight past it in the index, so a deep page costs the same
+as the first one, unlike an OFFSET that has to walk every earlier row.
+"""
+import base64
+import binascii
+import json
+import math
+
+from django.db.models import Q
+
+PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(row):
+    payload = json.dumps([row.match_score, row.id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """(match_score, id) of the row a previous page ended on"""
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        match_score, row_id = json.loads(payload)
+        match_score, row_id = float(match_score), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, OverflowError) as exc:
+        raise InvalidCursor(f'Invalid cursor: {token!r}') from exc
+    # JSON numbers like 1e999 and the NaN/Infinity literals never match a stored score
+    if not math.isfinite(match_score):
+        raise InvalidCursor(f'Invalid cursor: {token!r}')
+    return match_score, row_id
+
+
+def keyset_page(queryset, cursor=None, page_size=PAGE_SIZE):
+    """Return (rows, next cursor) for the page after `cursor`; the cursor is None on the last page"""
+    queryset = queryset.order_by('-match_score', 'id')
+    if cursor:
+        match_score, row_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(match_score__lt=match_score) | Q(match_score=match_score, id__gt=row_id)
+        )
+
+    # One extra row says whether another page follows without a COUNT query
+    rows = list(queryset[:page_size + 1])
+    if len(rows) > page_size:
+        return rows[:page_size], encode_cursor(rows[page_size - 1])
+    return rows, None
+
+
+def page_size_from(value, default=PAGE_SIZE):
+    """Clamp a ?limit= value to 1..MAX_PAGE_SIZE"""
+    try:
+        return min(max(int(value), 1), MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,17 @@
+"""Top-k selection for the per-career scoring loops.
+
+Scoring a career is cheap; building its recommendation (skill gaps, learning
+path, catalog details) is not. The loops therefore stream (row, total, ...)
+tuples through a bounded heap and only enrich the k survivors, so memory and
+enrichment work grow with k rather than with the catalog.
+"""
+import heapq
+
+
+def top_k(scored, k, ndigits):
+    """The k best (row, total, ...) tuples from the iterable `scored`, best first.
+
+    Selects and orders exactly like a stable sort of every career by
+    round(total * 100, ndigits), descending, which is how the engines rank.
+    """
+    return heapq.nsmallest(k, scored, key=lambda item: (-round(item[1] * 100, ndigits), item[0]))
@@ -0,0 +1,117 @@
+"""Per-user cache of generated career recommendations.
+
+Results are stored in the RECOMMENDATION_CACHE_ALIAS cache under a key built
+from the user's generation token and a fingerprint of the normalized scoring
+inputs plus the catalog version. Generation tokens live in the default cache,
+which every worker shares; saving a StudentProfile or AssessmentResult
+replaces the token, which orphans the user's old entries in every worker and
+leaves them to the result cache's LRU culling.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db.models import OuterRef, Subquery
+
+KEY_PREFIX = 'recommendations'
+
+
+def get_result_cache():
+    return caches[getattr(settings, 'RECOMMENDATION_CACHE_ALIAS', 'default')]
+
+
+def build_user_data(user):
+    """Scoring inputs for a user: latest personality type plus student profile fields"""
+    user_data = {'skills': '', 'education_level': 'high_school', 'preferences': {}}
+    profile = getattr(user, 'studentprofile', None)
+    if profile is not None:
+        user_data['skills'] = profile.skills
+        if profile.education_level:
+            user_data['education_level'] = profile.education_level
+
+    # Bulk callers annotate it with latest_personality_type_subquery() to skip the query
+    if hasattr(user, 'latest_personality_type'):
+        user_data['personality_type'] = user.latest_personality_type
+    else:
+        user_data['personality_type'] = latest_personality_types(user).first()
+    return user_data
+
+
+def latest_personality_types(user):
+    """Personality types from the user's results, newest first"""
+    from assessments.models import AssessmentResult
+
+    return (
+        AssessmentResult.objects.filter(user=user)
+        .exclude(personality_type='')
+        .order_by('-completed_at')
+        .values_list('personality_type', flat=True)
+    )
+
+
+def latest_personality_type_subquery():
+    """Annotation that lets build_user_data() read the type from a user queryset row"""
+    return Subquery(latest_personality_types(OuterRef('pk'))[:1])
+
+
+def normalize_user_data(user_data):
+    """Canonical form of the inputs that affect scoring; equal forms score identically"""
+    from .skill_index import parse_user_skills
+
+    return {
+        'personality_type': user_data.get('personality_type') or None,
+        # Skill order and repeats never change a score, so compare token sets
+        'skills': sorted(set(parse_user_skills(user_data.get('skills', '')))),
+        'education_level': user_data.get('education_level', 'high_school'),
+        'remote_work': user_data.get('preferences', {}).get('remote_work', 0.5),
+    }
+
+
+def profile_fingerprint(user_data, catalog_key, top_n):
+    payload = json.dumps([normalize_user_data(user_data), catalog_key, top_n], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def generation_key(user_id):
+    return f'{KEY_PREFIX}:generation:{user_id}'
+
+
+def result_key(user_id, generation, fingerprint):
+    return f'{KEY_PREFIX}:result:{user_id}:{generation}:{fingerprint}'
+
+
+def catalog_key(engine):
+    """Catalog version and scorer configuration for database-backed engines, a content hash otherwise"""
+    if engine.catalog_version is not None:
+        return f'v{engine.catalog_version}:{engine.scoring_key}'
+    return engine.catalog_fingerprint()
+
+
+def cached_recommendations(user_id, user_data, top_n=10, engine=None):
+    """Return (cache key, ranked recommendations); the key also names cached fragments"""
+    if engine is None:
+        from .engines import get_career_ai
+        engine = get_career_ai()
+    engine.sync_catalog()
+
+    generation = cache.get(generation_key(user_id), '0')
+    key = result_key(user_id, generation, profile_fingerprint(user_data, catalog_key(engine), top_n))
+
+    result_cache = get_result_cache()
+    recommendations = result_cache.get(key)
+    if recommendations is None:
+        recommendations = engine.generate_career_recommendations(user_data, top_n)
+        result_cache.set(key, recommendations)
+    return key, recommendations
+
+
+def get_recommendations(user_id, user_data, top_n=10, engine=None):
+    """Ranked recommendations for a user, served from the cache when the inputs are unchanged"""
+    return cached_recommendations(user_id, user_data, top_n, engine)[1]
+
+
+def invalidate_user_recommendations(user_id):
+    """Make every cached result for the user unreachable"""
+    cache.set(generation_key(user_id), uuid.uuid4().hex, None)
@@ -0,0 +1,226 @@
+"""Scoring components that make up a career match.
+
+A match is the weighted sum of independent scorers, each rating one aspect of
+a career for a user on a 0-1 scale. Every scorer is implemented twice: per
+career for the loop scoring mode, and as a users x careers matrix over the
+per-career feature arrays the matrix mode precomputes and career index
+artifacts persist. Both forms do the same float arithmetic, so the two modes
+rank identically.
+
+RECOMMENDATION_SCORERS lists the (dotted path, weight) pairs a deployment
+scores with; DEFAULT_SCORERS, the standard mix, is used when it is unset.
+"""
+import hashlib
+import json
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from .skill_index import parse_user_skills
+
+EDUCATION_LEVELS = {
+    'high_school': 1,
+    'undergraduate': 2,
+    'graduate': 3,
+    'phd': 4,
+    'working': 2.5  # Professional experience counts
+}
+
+
+def required_education_level(required_education):
+    """Map a career's free-text education requirement to a numeric level"""
+    return 2 if "Bachelor" in required_education else 3 if "Master" in required_education else 1
+
+
+DEFAULT_SCORERS = [
+    ('recommendations.scorers.PersonalityScorer', 0.25),
+    ('recommendations.scorers.SkillScorer', 0.30),
+    ('recommendations.scorers.EducationScorer', 0.20),
+    ('recommendations.scorers.MarketScorer', 0.25),
+]
+
+
+class Scorer:
+    # Key in detailed_scores
+    name = None
+    # Per-career arrays build_arrays() returns, persisted in career index artifacts
+    array_names = ()
+    # Rates the user's skills against the career's; shown as skill gap progress
+    measures_skills = False
+
+    def __init__(self, weight):
+        self.weight = weight
+
+    def config(self):
+        return [f'{type(self).__module__}.{type(self).__qualname__}', self.weight]
+
+    def score(self, engine, user_data, career):
+        """0-1 score of one career for one user"""
+        raise NotImplementedError
+
+    def build_arrays(self, engine, careers):
+        return {}
+
+    def score_batch(self, matrix, users, skill_matches):
+        """users x careers scores from the matrix's feature arrays"""
+        raise NotImplementedError
+
+
+class PersonalityScorer(Scorer):
+    """Mean cosine similarity of the user's type with the career's preferred types"""
+    name = 'personality'
+    array_names = ('personality_scores',)
+
+    def score(self, engine, user_data, career):
+        return engine.calculate_personality_compatibility(
+            user_data.get('personality_type'), career['personality_traits']
+        )
+
+    def build_arrays(self, engine, careers):
+        # The extra last column holds the 0.5 used for unknown personality types
+        scores = np.full((len(careers), len(engine.personality_types) + 1), 0.5)
+        for row, career in enumerate(careers):
+            scores[row, :-1] = engine.career_personality_vector(career['personality_traits'])
+        return {'personality_scores': scores}
+
+    def score_batch(self, matrix, users, skill_matches):
+        cols = [matrix.personality_column(user.get('personality_type')) for user in users]
+        return matrix.personality_scores[:, cols].T
+
+
+class SkillScorer(Scorer):
+    """Blend of exact and substring matches between user and required skills"""
+    name = 'skills'
+    measures_skills = True
+
+    def score(self, engine, user_data, career):
+        return engine.calculate_skill_match(user_data.get('skills', ''), career['skills'])
+
+    def score_batch(self, matrix, users, skill_matches):
+        return matrix.skills.match_scores(skill_matches)
+
+
+class SkillCoverageScorer(Scorer):
+    """Share of the career's required skills some user skill is a substring of"""
+    name = 'skill_coverage'
+    measures_skills = True
+
+    def score(self, engine, user_data, career):
+        tokens = parse_user_skills(user_data.get('skills', ''))
+        required = career['skills']
+        if not tokens or not required:
+            return 0.0
+        return (len(required) - len(engine.scan_missing_skills(required, tokens))) / len(required)
+
+    def score_batch(self, matrix, users, skill_matches):
+        return matrix.skills.coverage_scores(skill_matches)
+
+
+class EducationScorer(Scorer):
+    """Whether the user's education level meets the career's requirement"""
+    name = 'education'
+    array_names = ('education_levels',)
+
+    def score(self, engine, user_data, career):
+        return engine.calculate_education_compatibility(
+            user_data.get('education_level', 'high_school'), career['education_required']
+        )
+
+    def build_arrays(self, engine, careers):
+        return {'education_levels': np.array(
+            [required_education_level(career['education_required']) for career in careers],
+            dtype=np.float64
+        )}
+
+    def score_batch(self, matrix, users, skill_matches):
+        user_levels = np.array([
+            EDUCATION_LEVELS.get(user.get('education_level', 'high_school'), 1) for user in users
+        ], dtype=np.float64)[:, None]
+        return np.where(
+            user_levels >= matrix.education_levels, 1.0,
+            np.where(user_levels >= matrix.education_levels - 1, 0.7, 0.3)
+        )
+
+
+class MarketScorer(Scorer):
+    """Job growth and industry salary growth, plus remote work against the user's preference"""
+    name = 'market'
+    array_names = ('market_base', 'remote_friendly')
+
+    def score(self, engine, user_data, career):
+        return engine.calculate_market_factors(career, user_data.get('preferences', {}))
+
+    def build_arrays(self, engine, careers):
+        # Split the market factor into a per-career constant and a remote-work term
+        default_trends = {'growth': 10, 'remote_work': 50, 'salary_growth': 3}
+        market_base = np.empty(len(careers))
+        remote_friendly = np.empty(len(careers))
+        for row, career in enumerate(careers):
+            trends = engine.industry_trends.get(career['category'], default_trends)
+            market_score = 0.0
+            market_score += career['job_growth'] / 30 * 0.4
+            market_score += trends['salary_growth'] / 10 * 0.3
+            market_base[row] = market_score
+            remote_friendly[row] = career['remote_friendly']
+        return {'market_base': market_base, 'remote_friendly': remote_friendly}
+
+    def score_batch(self, matrix, users, skill_matches):
+        remote_preferences = np.array([
+            user.get('preferences', {}).get('remote_work', 0.5) for user in users
+        ], dtype=np.float64)[:, None]
+        return matrix.market_base + (matrix.remote_friendly * remote_preferences) * 0.3
+
+
+class DemandScorer(Scorer):
+    """The career's labour market demand score"""
+    name = 'demand'
+    array_names = ('demand_scores',)
+
+    def score(self, engine, user_data, career):
+        return career['demand_score'] / 100
+
+    def build_arrays(self, engine, careers):
+        return {'demand_scores': np.array([career['demand_score'] for career in careers], dtype=np.float64)}
+
+    def score_batch(self, matrix, users, skill_matches):
+        return np.broadcast_to(matrix.demand_scores / 100, (len(users), matrix.size))
+
+
+def load_scorers(config=None):
+    """Instantiate the configured scorers, RECOMMENDATION_SCORERS by default"""
+    if config is None:
+        try:
+            config = getattr(settings, 'RECOMMENDATION_SCORERS', DEFAULT_SCORERS)
+        except ImproperlyConfigured:
+            # Engines also run outside Django, e.g. in the benchmarks
+            config = DEFAULT_SCORERS
+
+    scorers = [import_string(path)(weight) for path, weight in config]
+    names = [scorer.name for scorer in scorers]
+    if not scorers or len(set(names)) != len(names):
+        raise ImproperlyConfigured(f'RECOMMENDATION_SCORERS needs distinct scorers, got {names}')
+    return scorers
+
+
+def skill_score_name(scorers=None):
+    """detailed_scores key of the first configured scorer that rates skills; None if there is none"""
+    for scorer in load_scorers() if scorers is None else scorers:
+        if scorer.measures_skills:
+            return scorer.name
+    return None
+
+
+def weighted_total(scorers, scores):
+    """Weighted sum of component scores, floats or arrays, added in scorer order"""
+    total = 0.0
+    for scorer, score in zip(scorers, scores):
+        total = total + score * scorer.weight
+    return total
+
+
+def scoring_key(scorers):
+    """Short stable name for a scorer configuration"""
+    payload = json.dumps([scorer.config() for scorer in scorers])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
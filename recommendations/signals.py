@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from assessments.models import AssessmentResult
+from users.models import StudentProfile
+
+from .catalog import catalog_changed
+from .jobs import enqueue_refresh
+from .models import Career, CareerSkill, PersonalityFit
+from .result_cache import invalidate_user_recommendations
+
+
+@receiver(post_save, sender=Career)
+@receiver(post_delete, sender=Career)
+@receiver(post_save, sender=CareerSkill)
+@receiver(post_delete, sender=CareerSkill)
+@receiver(post_save, sender=PersonalityFit)
+@receiver(post_delete, sender=PersonalityFit)
+def bump_catalog_version(sender, **kwargs):
+    # Skills and personality fits can change without saving their career,
+    # e.g. from the shell or a data migration
+    catalog_changed()
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_save, sender=AssessmentResult)
+def invalidate_cached_recommendations(sender, instance, **kwargs):
+    invalidate_user_recommendations(instance.user_id)
+
+
+@receiver(post_save, sender=StudentProfile)
+def refresh_materialized_recommendations(sender, instance, **kwargs):
+    # Assessment submissions enqueue their own job, which refreshes the rows too
+    user_id = instance.user_id
+    transaction.on_commit(lambda: enqueue_refresh(user_id))
@@ -0,0 +1,208 @@
+from collections import namedtuple
+
+import numpy as np
+from scipy import sparse
+
+from .artifacts import csr_arrays
+
+
+NGRAM_SIZE = 3
+
+# Cap on cached user skill tokens before the cache is reset
+TOKEN_CACHE_SIZE = 10000
+
+
+def normalize_skill(skill):
+    return skill.strip().lower()
+
+
+def parse_user_skills(user_skills):
+    """Split a comma-separated skill string into normalized tokens"""
+    return [normalize_skill(skill) for skill in user_skills.split(',')] if user_skills else []
+
+
+def ngrams(term, size=NGRAM_SIZE):
+    return {term[i:i + size] for i in range(len(term) - size + 1)}
+
+
+# Vocabulary columns a user's skills hit:
+#   exact   - the user listed the skill itself
+#   covered - a user skill is a substring of the required skill
+#   partial - covered, or the required skill is a substring of a user skill
+SkillMatch = namedtuple('SkillMatch', ['exact', 'covered', 'partial'])
+
+
+class SkillIndex:
+    """Normalized skill vocabulary over a career catalog.
+
+    Keeps an inverted index (skill -> careers requiring it) as term-major sparse
+    matrices and a trigram index over the vocabulary, so a user's skills are
+    resolved to vocabulary columns once and then scored against every career
+    with a sparse product instead of a per-career substring scan.
+    """
+
+    def __init__(self, skill_lists):
+        self.skill_lists = skill_lists
+        self.size = len(skill_lists)
+        self.vocab = []
+        self.vocab_index = {}
+
+        rows, cols, indptr = [], [], [0]
+        for row, skills in enumerate(skill_lists):
+            for skill in skills:
+                term = skill.lower()
+                col = self.vocab_index.get(term)
+                if col is None:
+                    col = self.vocab_index[term] = len(self.vocab)
+                    self.vocab.append(term)
+                rows.append(row)
+                cols.append(col)
+            indptr.append(len(cols))
+
+        # Vocabulary column of every required skill, per career, in catalog order
+        self.column_indices = np.array(cols, dtype=np.int32)
+        self.column_indptr = np.array(indptr, dtype=np.int64)
+
+        # Inverted index: one row per term listing the careers that require it.
+        # Partial matches count duplicated required skills, exact matches use sets.
+        shape = (len(self.vocab), self.size)
+        self.term_counts = sparse.csr_matrix((np.ones(len(rows)), (cols, rows)), shape=shape)
+        self.term_counts.sum_duplicates()
+        self.term_presence = self.term_counts.copy()
+        self.term_presence.data[:] = 1.0
+
+        self.finish()
+
+    @classmethod
+    def from_artifact(cls, skill_lists, artifact, prefix='skills'):
+        """Rebuild the index around memory-mapped arrays written by to_arrays()"""
+        index = cls.__new__(cls)
+        index.skill_lists = skill_lists
+        index.size = len(skill_lists)
+        index.vocab = artifact.vocab[prefix]
+        index.vocab_index = {term: col for col, term in enumerate(index.vocab)}
+        index.column_indices = artifact.array(f'{prefix}.column_indices')
+        index.column_indptr = artifact.array(f'{prefix}.column_indptr')
+        index.term_counts = artifact.csr(f'{prefix}.term_counts')
+        index.term_presence = sparse.csr_matrix(
+            (np.ones(index.term_counts.nnz), index.term_counts.indices, index.term_counts.indptr),
+            shape=index.term_counts.shape, copy=False
+        )
+        index.finish()
+        return index
+
+    def to_arrays(self, prefix='skills'):
+        """Return (arrays, vocab, shapes) for writing this index into an artifact"""
+        arrays = {
+            f'{prefix}.column_indices': self.column_indices,
+            f'{prefix}.column_indptr': self.column_indptr,
+            **csr_arrays(f'{prefix}.term_counts', self.term_counts),
+        }
+        return arrays, {prefix: self.vocab}, {f'{prefix}.term_counts': self.term_counts.shape}
+
+    def finish(self):
+        self.token_cache = {}
+        self._ngram_index = None
+        self.skill_counts = np.diff(self.column_indptr).astype(np.float64)
+        self.has_skills = self.skill_counts > 0
+        self.skill_divisor = np.where(self.has_skills, self.skill_counts, 1.0)
+        self.longest_term = max((len(term) for term in self.vocab), default=0)
+
+    @property
+    def ngram_index(self):
+        """Trigram -> vocabulary columns, built on the first substring lookup"""
+        if self._ngram_index is None:
+            self._ngram_index = {}
+            for col, term in enumerate(self.vocab):
+                for gram in ngrams(term):
+                    self._ngram_index.setdefault(gram, set()).add(col)
+        return self._ngram_index
+
+    def career_columns(self, row):
+        return self.column_indices[self.column_indptr[row]:self.column_indptr[row + 1]]
+
+    def containing_columns(self, token):
+        """Vocabulary columns whose term contains `token` as a substring"""
+        if len(token) < NGRAM_SIZE:
+            return {col for col, term in enumerate(self.vocab) if token in term}
+
+        postings = sorted((self.ngram_index.get(gram, set()) for gram in ngrams(token)), key=len)
+        candidates = set.intersection(*postings)
+        return {col for col in candidates if token in self.vocab[col]}
+
+    def contained_columns(self, token):
+        """Vocabulary columns whose term is a substring of `token`"""
+        cols = set()
+        for start in range(len(token) + 1):
+            for end in range(start, min(len(token), start + self.longest_term) + 1):
+                col = self.vocab_index.get(token[start:end])
+                if col is not None:
+                    cols.add(col)
+        return cols
+
+    def token_match(self, token):
+        match = self.token_cache.get(token)
+        if match is None:
+            if len(self.token_cache) >= TOKEN_CACHE_SIZE:
+                self.token_cache.clear()
+            exact = self.vocab_index.get(token)
+            covered = self.containing_columns(token)
+            match = self.token_cache[token] = SkillMatch(
+                frozenset() if exact is None else frozenset([exact]),
+                frozenset(covered),
+                frozenset(covered | self.contained_columns(token)),
+            )
+        return match
+
+    def match(self, user_skills):
+        """Resolve a comma-separated skill string to vocabulary columns, or None if it is empty"""
+        if not user_skills:
+            return None
+
+        exact, covered, partial = set(), set(), set()
+        for token in set(parse_user_skills(user_skills)):
+            token_match = self.token_match(token)
+            exact |= token_match.exact
+            covered |= token_match.covered
+            partial |= token_match.partial
+        return SkillMatch(exact, covered, partial)
+
+    def hit_matrix(self, matches, field):
+        """Users x vocabulary indicator matrix for one SkillMatch field"""
+        rows, cols = [], []
+        for row, match in enumerate(matches):
+            if match is not None:
+                hit_cols = getattr(match, field)
+                rows.extend([row] * len(hit_cols))
+                cols.extend(hit_cols)
+        shape = (len(matches), len(self.vocab))
+        return sparse.csr_matrix((np.ones(len(cols)), (rows, cols)), shape=shape)
+
+    def hit_counts(self, matches, field, term_matrix):
+        return (self.hit_matrix(matches, field) @ term_matrix).toarray()
+
+    def match_scores(self, matches):
+        """Blend of exact and partial skill matches, as computed by AdvancedCareerAI"""
+        exact_score = self.hit_counts(matches, 'exact', self.term_presence) / self.skill_divisor
+        partial_score = self.hit_counts(matches, 'partial', self.term_counts) / self.skill_divisor
+        scores = np.where(self.has_skills, exact_score * 0.7 + partial_score * 0.3, 0.3)
+        scores[[match is None for match in matches]] = 0.3
+        return scores
+
+    def coverage_scores(self, matches):
+        """Share of each career's required skills covered by a user skill, as SkillCoverageScorer computes it"""
+        scores = self.hit_counts(matches, 'covered', self.term_counts) / self.skill_divisor
+        scores[[match is None for match in matches]] = 0.0
+        return scores
+
+    def missing_skills(self, row, match, limit=None, within=None):
+        """Required skills of a career that no user skill covers, in catalog order.
+
+        `within` restricts the check to the career's first N required skills.
+        """
+        covered = match.covered if match is not None else ()
+        missing = [
+            skill for skill, col in zip(self.skill_lists[row][:within], self.career_columns(row)[:within])
+            if col not in covered
+        ]
+        return missing[:limit]
@@ -0,0 +1,131 @@
+"""Synthetic students, assessment answers and recommendations for load testing.
+
+``generate_users`` builds the rows of a range of users as plain field dicts.
+It doesn't need Django, so ``generate_load_data`` can run it in spawned
+worker processes that never touch the database. Every
+user draws from its own RNG, seeded from the run seed and the user's index,
+and every primary key is derived from that index. A seed therefore
+reproduces the same rows whatever the batch size or worker count.
+"""
+import random
+
+from assessments.scoring import score_batch
+
+SKILLS = [
+    'Python', 'SQL', 'Machine Learning', 'Java', 'JavaScript', 'Figma', 'R', 'SEO',
+    'Data Analysis', 'Testing', 'Cloud Computing', 'User Research', 'Statistics',
+    'Marketing Automation', 'Project Management', 'Communication', 'Excel', 'Leadership',
+]
+INTERESTS = ['Technology', 'Design', 'Marketing', 'Business', 'Healthcare', 'Research', 'Teaching']
+FIELDS_OF_STUDY = ['Computer Science', 'Business', 'Psychology', 'Design', 'Biology', 'Economics']
+EDUCATION_LEVELS = ['high_school', 'undergraduate', 'graduate', 'phd', 'working']
+SCORE_COMPONENTS = ['personality', 'skills', 'education', 'market']
+DIMENSIONS = ('EI', 'SN', 'TF', 'JP')
+
+# Share of the assessments each user has completed
+COMPLETION_RATE = 0.8
+
+_context = None
+
+
+def user_rng(seed, index):
+    return random.Random(seed * 1_000_003 + index)
+
+
+def assessment_questions(question_count):
+    """(text, [(value, text), ...]) per question, choices alternating over the MBTI dimensions"""
+    return [
+        (f'Question {order + 1}', [(value, f'I lean {value}') for value in DIMENSIONS[order % 4]])
+        for order in range(question_count)
+    ]
+
+
+def answers_payload(rng, questions):
+    """AssessmentResult.score for one random answer per question"""
+    payload = {}
+    for question_id, question_text, choices in questions:
+        choice_id, value, weight, choice_text = rng.choice(choices)
+        payload[str(question_id)] = {
+            'choice_id': choice_id,
+            'value': value,
+            'weight': weight,
+            'question_text': question_text,
+            'choice_text': choice_text,
+        }
+    return payload
+
+
+def generate_users(context, start, stop):
+    """{table: [field dicts]} for users start..stop-1.
+
+    `context` holds the run seed, username prefix, password hash, first ids,
+    recommendations per user, the saved assessments as (id, questions) with
+    questions as (id, text, [(choice id, value, weight, text), ...]), and the
+    catalog careers to recommend.
+    """
+    seed, prefix = context['seed'], context['prefix']
+    first_ids = context['first_ids']
+    assessments = context['assessments']
+    careers = context['careers']
+    recommendation_count = min(context['recommendations'], len(careers))
+
+    rows = {'users': [], 'profiles': [], 'results': [], 'recommendations': []}
+    for index in range(start, stop):
+        rng = user_rng(seed, index)
+        user_id = first_ids['users'] + index
+        username = f'{prefix}{index}'
+        rows['users'].append({
+            'id': user_id, 'username': username, 'email': f'{username}@example.com',
+            'password': context['password'], 'user_type': 'student',
+        })
+        rows['profiles'].append({
+            'id': first_ids['profiles'] + index, 'user_id': user_id,
+            'education_level': rng.choice(EDUCATION_LEVELS),
+            'field_of_study': rng.choice(FIELDS_OF_STUDY),
+            'skills': ', '.join(rng.sample(SKILLS, rng.randint(0, 6))),
+            'interests': ', '.join(rng.sample(INTERESTS, rng.randint(1, 3))),
+        })
+
+        for position, (assessment_id, questions) in enumerate(assessments):
+            if rng.random() < COMPLETION_RATE:
+                rows['results'].append({
+                    'id': first_ids['results'] + index * len(assessments) + position,
+                    'user_id': user_id, 'assessment_id': assessment_id,
+                    'score': answers_payload(rng, questions),
+                })
+
+        scores = sorted((round(rng.uniform(35, 98), 1) for _ in range(recommendation_count)), reverse=True)
+        for rank, (career, match_score) in enumerate(zip(rng.sample(careers, recommendation_count), scores), 1):
+            rows['recommendations'].append({
+                'id': first_ids['recommendations'] + index * context['recommendations'] + rank - 1,
+                'user_id': user_id, 'career_title': career['title'], 'category': career['category'],
+                'rank': rank, 'match_score': match_score,
+                'detailed_scores': {name: round(rng.uniform(20, 100), 1) for name in SCORE_COMPONENTS},
+                'missing_skills': rng.sample(career['skills'], min(len(career['skills']), rng.randint(0, 4))),
+                'career_details': career['details'],
+            })
+
+    # One vectorized pass over every payload of the range
+    profiles = score_batch([result['score'] for result in rows['results']])
+    for result, profile in zip(rows['results'], profiles):
+        result['personality_type'] = profile.personality_type
+        result['dominant_traits'] = profile.dominant_traits
+    return rows
+
+
+def init_worker(context):
+    """Process pool initializer: keep the run context for generate_range()"""
+    global _context
+    _context = context
+
+
+def init_writer(context):
+    """Process pool initializer for workers that also write their rows"""
+    import django
+
+    django.setup()
+    init_worker(context)
+
+
+def generate_range(start, stop):
+    return generate_users(_context, start, stop)
@@ -1,3 +1,835 @@
-from django.test import TestCase
+import base64
+import io
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from assessments.models import Assessment, AssessmentResult
+from users.models import StudentProfile
+
+from . import ai_engine, engines
+from .ai_engine import AdvancedCareerAI
+from .catalog import DatabaseCatalog, database_catalog, load_catalog, read_catalog
+from .jobs import JOB_RESULTS, MAX_ATTEMPTS, claim_next_job, enqueue_recommendations, requeue_stale_jobs, run_job
+from .materialize import (
+    current_fingerprint, materialize_recommendations, ranked_recommendations, refresh_user_recommendations
+)
+from .models import (
+    Career, CareerRecommendation, CatalogVersion, LearningPath, RecommendationJob, SkillGapAnalysis
+)
+from .pagination import PAGE_SIZE, encode_cursor, keyset_page
+from .result_cache import (
+    build_user_data, get_recommendations, get_result_cache, latest_personality_types, profile_fingerprint
+)
+from .scorers import load_scorers
+from .skill_index import SkillIndex, parse_user_skills
+from .text_index import CareerTextIndex
+
+User = get_user_model()
+
+
+def synthetic_careers(count, seed=0):
+    """Random careers that exercise every branch of the scoring functions"""
+    rng = random.Random(seed)
+    skills = ['Python', 'SQL', 'Machine Learning', 'Java', 'Figma', 'R', 'SEO',
+              'Data Analysis', 'Testing', 'Cloud Computing', 'User Research']
+    types = ['INTJ', 'ENFP', 'ISTJ', 'ESFP', 'INFJ', 'ENTP', 'XXXX']
+    categories = ['Technology', 'Design', 'Marketing', 'Business', 'Law']
+    return [
+        {
+            'id': i,
+            'title': f'Career {i}',
+            'category': rng.choice(categories),
+            'skills': rng.sample(skills, rng.randint(0, 6)) + rng.sample(skills, rng.randint(0, 2)),
+            'personality_traits': rng.sample(types, rng.randint(0, 4)),
+            'education_required': rng.choice(["Bachelor's degree", "Master's degree", 'None']),
+            'experience_level': 'Entry',
+            'salary_range': {'min': 40000, 'max': 90000, 'median': 60000},
+            'job_growth': rng.randint(0, 40),
+            'demand_score': rng.randint(50, 100),
+            'remote_friendly': rng.random() < 0.5,
+            'stress_level': 'Medium',
+            'description': f'Description of career {i}',
+            'day_to_day': [],
+            'companies': [],
+        }
+        for i in range(count)
+    ]
+
+
+USER_PROFILES = [
+    {'personality_type': 'INTJ', 'skills': 'Python, SQL, machine learning', 'education_level': 'graduate'},
+    {'personality_type': 'ENFP', 'skills': 'figma, user research', 'preferences': {'remote_work': 0.9}},
+    {'personality_type': 'XXXX', 'skills': 'r, ', 'education_level': 'working'},
+    {'personality_type': None, 'skills': '', 'education_level': 'phd'},
+    {},
+]
+
+
+class MatrixScoringTests(SimpleTestCase):
+    def assert_modes_agree(self, careers):
+        loop_engine = AdvancedCareerAI(scoring_mode='loop')
+        matrix_engine = AdvancedCareerAI(scoring_mode='matrix')
+        loop_engine.career_database = careers
+        matrix_engine.career_database = careers
+
+        for user_data in USER_PROFILES:
+            with self.subTest(user_data=user_data):
+                self.assertEqual(
+                    matrix_engine.generate_career_recommendations(user_data, top_n=10),
+                    loop_engine.generate_career_recommendations(user_data, top_n=10),
+                )
+
+    def test_matches_loop_scoring_on_builtin_catalog(self):
+        self.assert_modes_agree(AdvancedCareerAI().load_career_database())
+
+    def test_matches_loop_scoring_on_synthetic_catalog(self):
+        self.assert_modes_agree(synthetic_careers(500))
+
+    def test_rejects_unknown_scoring_mode(self):
+        with self.assertRaises(ValueError):
+            AdvancedCareerAI(scoring_mode='gpu')
+
+    def test_batch_matches_loop_recommendations(self):
+        careers = synthetic_careers(300, seed=1)
+        matrix_engine = AdvancedCareerAI()
+        loop_engine = AdvancedCareerAI(scoring_mode='loop')
+        matrix_engine.career_database = careers
+        loop_engine.career_database = careers
+        users = USER_PROFILES * 3
+
+        batches = list(matrix_engine.generate_batch_recommendations(users, top_n=5, chunk_size=4))
+
+        self.assertEqual(len(batches), len(users))
+        for user_data, recommendations in zip(users, batches):
+            self.assertEqual(recommendations, loop_engine.generate_career_recommendations(user_data, top_n=5))
+
+
+class TopKSelectionTests(SimpleTestCase):
+    """The loop scorer ranks like a full stable sort but only enriches the survivors"""
+
+    def setUp(self):
+        self.careers = synthetic_careers(300, seed=2)
+
+    def test_advanced_engine_enriches_only_top_n(self):
+        engine = AdvancedCareerAI(scoring_mode='loop')
+        engine.career_database = self.careers
+        for user_data in USER_PROFILES:
+            ranked = sorted(engine.score_careers(user_data), key=lambda item: -round(item[1] * 100, 1))
+            with mock.patch.object(engine, 'build_recommendation',
+                                   wraps=engine.build_recommendation) as build:
+                recommendations = engine.generate_career_recommendations(user_data, top_n=10)
+            self.assertEqual(build.call_count, 10)
+            self.assertEqual([rec['career'] for rec in recommendations],
+                             [self.careers[item[0]]['title'] for item in ranked[:10]])
+
+
+class ScorerTests(SimpleTestCase):
+    """Scorer components are pluggable and score identically in both modes"""
+
+    custom_scorers = [
+        ('recommendations.scorers.PersonalityScorer', 0.4),
+        ('recommendations.scorers.SkillCoverageScorer', 0.4),
+        ('recommendations.scorers.DemandScorer', 0.2),
+    ]
+
+    def test_custom_scorers_agree_across_modes(self):
+        careers = synthetic_careers(300, seed=5)
+        loop_engine = AdvancedCareerAI(scoring_mode='loop', scorers=load_scorers(self.custom_scorers))
+        matrix_engine = AdvancedCareerAI(scorers=load_scorers(self.custom_scorers))
+        loop_engine.career_database = careers
+        matrix_engine.career_database = careers
+
+        for user_data in USER_PROFILES:
+            with self.subTest(user_data=user_data):
+                recommendations = matrix_engine.generate_career_recommendations(user_data, top_n=10)
+                self.assertEqual(recommendations,
+                                 loop_engine.generate_career_recommendations(user_data, top_n=10))
+                self.assertEqual(list(recommendations[0]['detailed_scores']),
+                                 ['personality', 'skill_coverage', 'demand'])
+
+    def test_weights_come_from_settings(self):
+        with override_settings(RECOMMENDATION_SCORERS=self.custom_scorers):
+            engine = AdvancedCareerAI()
+        self.assertEqual([scorer.weight for scorer in engine.scorers], [0.4, 0.4, 0.2])
+        self.assertNotEqual(engine.scoring_key, AdvancedCareerAI().scoring_key)
+        self.assertNotEqual(engine.catalog_fingerprint(), AdvancedCareerAI().catalog_fingerprint())
+
+    def test_scorer_names_must_be_distinct(self):
+        with self.assertRaises(ImproperlyConfigured):
+            load_scorers([('recommendations.scorers.SkillScorer', 0.5)] * 2)
+
+
+class PersonalityTableTests(SimpleTestCase):
+    def test_lookup_matches_per_call_cosine(self):
+        from benchmarks.personality import per_call_compatibility
+
+        engine = AdvancedCareerAI()
+        trait_lists = [career['personality_traits'] for career in synthetic_careers(50)]
+        trait_lists += [['INTJ'] * 9 + ['ESFP'], ['XXXX'], []]
+        for ptype in engine.personality_types + ['XXXX', None]:
+            for traits in trait_lists:
+                self.assertEqual(
+                    engine.calculate_personality_compatibility(ptype, traits),
+                    per_call_compatibility(engine.personality_mapping, ptype, traits),
+                )
+
+
+    def test_catalog_reload_drops_cached_career_vectors(self):
+        engine = AdvancedCareerAI()
+        engine.set_career_database(synthetic_careers(50))
+        engine.generate_career_recommendations(USER_PROFILES[0], top_n=5)
+        self.assertTrue(engine.career_personality_cache)
+
+        engine.set_career_database(synthetic_careers(50, seed=1))
+        self.assertEqual(engine.career_personality_cache, {})
+
+class SkillIndexTests(SimpleTestCase):
+    user_skill_strings = ['python, sql', 'py', 'r, ', 'machine learning engineer', 'SEO,Figma', '', 'data']
+
+    def test_scores_and_gaps_match_substring_scan(self):
+        careers = synthetic_careers(200, seed=2)
+        index = SkillIndex([career['skills'] for career in careers])
+        engine = AdvancedCareerAI(scoring_mode='loop')
+
+        for user_skills in self.user_skill_strings:
+            match = index.match(user_skills)
+            match_scores = index.match_scores([match])[0]
+            coverage_scores = index.coverage_scores([match])[0]
+            tokens = parse_user_skills(user_skills)
+            for row, career in enumerate(careers):
+                required = [skill.lower() for skill in career['skills']]
+                covered = sum(1 for skill in required if any(token in skill for token in tokens))
+                with self.subTest(user_skills=user_skills, row=row):
+                    self.assertEqual(match_scores[row], engine.calculate_skill_match(user_skills, career['skills']))
+                    self.assertEqual(coverage_scores[row], covered / len(required) if tokens and required else 0)
+                    self.assertEqual(
+                        index.missing_skills(row, match),
+                        engine.scan_missing_skills(career['skills'], tokens),
+                    )
+
+
+class CareerTextIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.engine = AdvancedCareerAI()
+        self.index_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.index_dir)
+
+    def test_query_ranks_by_text_similarity(self):
+        index = CareerTextIndex.build(self.engine.career_database, self.engine.skill_vectorizer)
+        rows = [row for row, _ in index.query('machine learning and statistics with python', top_n=3)]
+        self.assertEqual(self.engine.career_database[rows[0]]['title'], 'Data Scientist')
+        self.assertEqual(index.query('zzzz', top_n=3), [])
+
+    def test_index_without_artifact_is_built_in_memory(self):
+        engine = AdvancedCareerAI(index_dir=self.index_dir)
+        rows = [row for row, _ in engine.text_index.query('machine learning and statistics with python')]
+        self.assertEqual(engine.career_database[rows[0]]['title'], 'Data Scientist')
+        # Only write_career_index() persists the index, as a versioned artifact
+        self.assertEqual(os.listdir(self.index_dir), [])
+
+        engine.set_career_database(engine.career_database + synthetic_careers(1))
+        self.assertEqual(engine.text_index.matrix.shape[0], len(engine.career_database))
+
+
+class CareerIndexArtifactTests(SimpleTestCase):
+    def setUp(self):
+        self.index_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.index_dir)
+
+    def engine(self, careers):
+        engine = AdvancedCareerAI(index_dir=self.index_dir)
+        engine.career_database = careers
+        return engine
+
+    def test_memory_mapped_index_matches_in_memory_build(self):
+        careers = synthetic_careers(200, seed=3)
+        self.engine(careers).write_career_index()
+
+        loaded = self.engine(careers)
+        self.assertIsNotNone(loaded.artifact)
+        self.assertIsInstance(loaded.feature_matrix.personality_scores, np.memmap)
+
+        in_memory = self.engine(careers)
+        in_memory.index_dir = None
+        for user_data in USER_PROFILES:
+            self.assertEqual(
+                loaded.generate_career_recommendations(user_data),
+                in_memory.generate_career_recommendations(user_data),
+            )
+        self.assertEqual(
+            loaded.find_similar_careers('python data analysis'),
+            in_memory.find_similar_careers('python data analysis'),
+        )
+
+    def test_stale_artifact_is_ignored(self):
+        self.engine(synthetic_careers(20, seed=4)).write_career_index()
+        self.assertIsNone(self.engine(synthetic_careers(21, seed=4)).artifact)
+
+
+class EngineAccessorTests(SimpleTestCase):
+    def test_engines_are_created_once_and_shared(self):
+        self.assertIs(engines.get_career_ai(), engines.get_career_ai())
+        self.assertIs(ai_engine.career_ai, engines.get_career_ai())
+        self.assertIsInstance(engines.get_career_ai(), AdvancedCareerAI)
+
+    def test_backend_follows_settings(self):
+        self.addCleanup(engines.reset_engines)
+        for backend in engines.backend_names():
+            engines.reset_engines()
+            with self.subTest(backend=backend), override_settings(RECOMMENDATION_ENGINE_BACKEND=backend):
+                self.assertEqual(engines.get_career_ai().scoring_mode, backend)
+
+        with override_settings(RECOMMENDATION_ENGINE_BACKEND='quantum'):
+            with self.assertRaises(ImproperlyConfigured):
+                engines.build_engine()
+
+    def test_boot_does_not_import_scientific_packages(self):
+        from benchmarks.startup import BOOT_SNIPPET, HEAVY_PACKAGES
+
+        check = BOOT_SNIPPET + (
+            "import sys\n"
+            f"print(','.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', check], capture_output=True, text=True, check=True,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE='core.settings'),
+        )
+        self.assertEqual(result.stdout.strip(), '')
+
+
+class BenchmarkBaselineTests(SimpleTestCase):
+    def test_saved_baseline_flags_slower_cases(self):
+        from benchmarks.suite import compare, load_baseline, save_baseline, summarize
+
+        workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, workdir)
+        path = os.path.join(workdir, 'benchmarks', 'baseline.json')
+        save_baseline(path, {'fast': summarize([1.0, 2.0, 3.0]), 'slow': summarize([1.0, 2.0, 3.0])})
+
+        results = {'fast': summarize([2.1]), 'slow': summarize([2.5]), 'added': summarize([9.0])}
+        changes, regressions = compare(results, load_baseline(path)['results'], tolerance=0.2)
+        self.assertEqual(set(changes), {'fast', 'slow'})
+        self.assertAlmostEqual(changes['slow'], 0.25)
+        self.assertEqual(regressions, ['slow'])
+
+
+class DatabaseCatalogTests(TestCase):
+    def setUp(self):
+        self.builtin = AdvancedCareerAI().load_career_database()
+        load_catalog(self.builtin)
+
+    def strip_ids(self, careers):
+        return [{key: value for key, value in career.items() if key != 'id'} for career in careers]
+
+    def test_round_trips_builtin_catalog(self):
+        self.assertEqual(self.strip_ids(read_catalog()), self.strip_ids(self.builtin))
+
+    def test_engine_scores_database_snapshot(self):
+        engine = AdvancedCareerAI(catalog=DatabaseCatalog(check_interval=0))
+        for user_data in USER_PROFILES:
+            self.assertEqual(
+                engine.generate_career_recommendations(user_data),
+                AdvancedCareerAI().generate_career_recommendations(user_data),
+            )
+
+    def test_snapshot_reloads_only_when_version_changes(self):
+        catalog = DatabaseCatalog(check_interval=0)
+        engine = AdvancedCareerAI(catalog=catalog)
+        engine.sync_catalog()
+        with self.assertNumQueries(1):
+            engine.sync_catalog()
+
+        Career.objects.filter(title='Data Scientist').update(title='Data Science Lead')
+        CatalogVersion.bump()
+        engine.sync_catalog()
+        self.assertIn('Data Science Lead', [career['title'] for career in engine.career_database])
+
+    def test_saving_a_career_bumps_the_version(self):
+        version = CatalogVersion.current()
+        career = Career.objects.get(title='Product Manager')
+        career.demand_score = 50
+        career.save()
+        self.assertEqual(CatalogVersion.current(), version + 1)
+
+    def test_editing_skills_and_fits_bumps_the_version(self):
+        career = Career.objects.get(title='Product Manager')
+        skill = career.skills.first()
+        fit = career.personality_fits.first()
+        for change in (lambda: skill.save(), lambda: fit.delete(),
+                       lambda: career.personality_fits.create(personality_type='ISTP', order=99)):
+            version = CatalogVersion.current()
+            change()
+            self.assertEqual(CatalogVersion.current(), version + 1)
+
+    def test_version_is_checked_at_most_once_per_interval(self):
+        catalog = DatabaseCatalog(check_interval=3600)
+        catalog.snapshot()
+        with self.assertNumQueries(0):
+            catalog.snapshot()
+
+
+class RecommendationResultCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_result_cache().clear()
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.profile = StudentProfile.objects.create(
+            user=self.user, education_level='graduate', skills='Python, SQL'
+        )
+        self.engine = AdvancedCareerAI()
+
+    def cached_recommendations(self):
+        with mock.patch.object(self.engine, 'generate_career_recommendations',
+                               wraps=self.engine.generate_career_recommendations) as generate:
+            recommendations = get_recommendations(
+                self.user.id, build_user_data(self.user), engine=self.engine
+            )
+        return recommendations, generate.call_count
+
+    def test_repeat_lookup_is_a_cache_hit(self):
+        first, computed = self.cached_recommendations()
+        self.assertEqual(computed, 1)
+        second, computed = self.cached_recommendations()
+        self.assertEqual(computed, 0)
+        self.assertEqual(first, second)
+
+    def test_fingerprint_ignores_skill_order_and_case(self):
+        self.assertEqual(
+            profile_fingerprint({'skills': 'Python, SQL'}, 'v1', 10),
+            profile_fingerprint({'skills': 'sql,python, Python'}, 'v1', 10),
+        )
+        self.assertNotEqual(
+            profile_fingerprint({'skills': 'Python'}, 'v1', 10),
+            profile_fingerprint({'skills': 'Python'}, 'v2', 10),
+        )
+
+    def test_saving_profile_invalidates(self):
+        self.cached_recommendations()
+        self.profile.save()
+        _, computed = self.cached_recommendations()
+        self.assertEqual(computed, 1)
+
+    def test_saving_assessment_result_invalidates(self):
+        self.cached_recommendations()
+        assessment = Assessment.objects.create(
+            title='MBTI', description='', assessment_type='personality', time_required=10
+        )
+        AssessmentResult.objects.create(
+            user=self.user, assessment=assessment, score={}, personality_type='INTJ'
+        )
+        recommendations, computed = self.cached_recommendations()
+        self.assertEqual(computed, 1)
+        self.assertEqual(
+            recommendations,
+            self.engine.generate_career_recommendations(
+                {'personality_type': 'INTJ', 'skills': 'Python, SQL', 'education_level': 'graduate',
+                 'preferences': {}}
+            ),
+        )
+
+    def test_dashboard_renders_cached_recommendations(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('recommendations:recommendation_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['recommendations'])
+        self.assertEqual(response.context['recommendations'][0].rank, 1)
+
+    def test_career_paths_fragment_follows_profile_changes(self):
+        self.client.force_login(self.user)
+        url = reverse('recommendations:career_paths')
+        first = self.client.get(url)
+        self.assertTrue(first.context['categorized_recommendations'])
+        self.assertEqual(self.client.get(url).context['recommendations_key'],
+                         first.context['recommendations_key'])
+
+        self.profile.skills = 'Figma, user research'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.save()
+        call_command('run_recommendation_worker', burst=True, stdout=io.StringIO())
+        self.assertNotEqual(self.client.get(url).context['recommendations_key'],
+                            first.context['recommendations_key'])
+
+
+class MaterializedRecommendationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_result_cache().clear()
+        self.user = User.objects.create_user(username='student', password='secret')
+        StudentProfile.objects.create(user=self.user, education_level='graduate', skills='Python, SQL')
+        self.engine = AdvancedCareerAI()
+
+    def test_rows_follow_the_ranked_recommendations(self):
+        self.assertTrue(refresh_user_recommendations(self.user, top_n=5, engine=self.engine))
+        expected = self.engine.generate_career_recommendations(build_user_data(self.user), 5)
+        rows = list(ranked_recommendations(self.user))
+        self.assertEqual([row.career_title for row in rows], [rec['career'] for rec in expected])
+        self.assertEqual([row.rank for row in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(rows[0].career_details['salary_range'], expected[0]['salary_range'])
+
+        # Unchanged inputs leave the rows alone
+        self.assertFalse(refresh_user_recommendations(self.user, top_n=5, engine=self.engine))
+
+    def test_dropped_careers_are_deleted_unless_starred(self):
+        refresh_user_recommendations(self.user, top_n=5, engine=self.engine)
+        rows = list(ranked_recommendations(self.user))
+        CareerRecommendation.objects.filter(id=rows[3].id).update(is_favorite=True)
+
+        top = self.engine.generate_career_recommendations(build_user_data(self.user), 3)
+        with self.assertNumQueries(6):
+            materialize_recommendations(self.user, top, 'new')
+
+        remaining = CareerRecommendation.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            [(row.career_title, row.rank) for row in remaining],
+            [(row.career_title, row.rank) for row in rows[:3]] + [(rows[3].career_title, None)],
+        )
+        self.assertTrue(remaining.get(id=rows[3].id).is_favorite)
+
+    def test_pages_read_rows_with_one_query(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('recommendations:recommendation_dashboard'))
+
+        for name in ['recommendation_dashboard', 'career_paths', 'skill_gap_analysis']:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse(f'recommendations:{name}'))
+            self.assertEqual(response.status_code, 200)
+            reads = [query['sql'] for query in queries if 'careerrecommendation' in query['sql']]
+            self.assertEqual(len(reads), 1, name)
+
+        top = ranked_recommendations(self.user).first()
+        response = self.client.get(reverse('recommendations:skill_gap_analysis'))
+        self.assertEqual(response.context['target_career'], top.career_title)
+        self.assertEqual(response.context['missing_skills'], top.missing_skills)
+
+    def test_skill_gap_progress_follows_the_configured_skill_scorer(self):
+        scorers = [
+            ('recommendations.scorers.PersonalityScorer', 0.5),
+            ('recommendations.scorers.SkillCoverageScorer', 0.5),
+        ]
+        with override_settings(RECOMMENDATION_SCORERS=scorers):
+            engine = AdvancedCareerAI()
+            refresh_user_recommendations(self.user, top_n=5, engine=engine)
+            top = ranked_recommendations(self.user).first()
+            self.client.force_login(self.user)
+            response = self.client.get(reverse('recommendations:skill_gap_analysis'))
+        self.assertGreater(top.detailed_scores['skill_coverage'], 0)
+        self.assertEqual(response.context['progress_percentage'], top.detailed_scores['skill_coverage'])
+
+    def test_catalog_edit_queues_a_refresh_of_served_rows(self):
+        load_catalog(AdvancedCareerAI().load_career_database())
+        engines.reset_engines()
+        self.addCleanup(engines.reset_engines)
+        # The shared catalog would keep serving this test's careers after the rollback
+        self.addCleanup(database_catalog.invalidate)
+        self.client.force_login(self.user)
+        url = reverse('recommendations:recommendation_dashboard')
+        self.client.get(url)
+        top = ranked_recommendations(self.user).first()
+
+        self.client.get(url)
+        self.assertFalse(RecommendationJob.objects.filter(user=self.user).exists())
+
+        Career.objects.filter(title=top.career_title).delete()
+        response = self.client.get(url)
+        self.assertEqual(response.context['recommendations'][0].career_title, top.career_title)
+        self.assertTrue(RecommendationJob.objects.filter(
+            user=self.user, status=RecommendationJob.PENDING).exists())
+
+        call_command('run_recommendation_worker', burst=True, stdout=io.StringIO())
+        response = self.client.get(url)
+        self.assertNotIn(top.career_title, [row.career_title for row in response.context['recommendations']])
+
+    def test_command_skips_current_users(self):
+        other = User.objects.create_user(username='other', password='secret')
+        stdout = io.StringIO()
+        call_command('materialize_recommendations', stdout=stdout)
+        self.assertIn('Materialized recommendations for 2 of 2 users', stdout.getvalue())
+        self.assertTrue(ranked_recommendations(other).exists())
+
+        # Matches the rows a single refresh writes, so nothing is stale afterwards
+        self.assertFalse(refresh_user_recommendations(self.user))
+        stdout = io.StringIO()
+        call_command('materialize_recommendations', stdout=stdout)
+        self.assertIn('Materialized recommendations for 0 of 2 users', stdout.getvalue())
+
+
+class GenerateLoadDataTests(TestCase):
+    def generate(self, **options):
+        options = {'users': 7, 'assessments': 2, 'questions': 8, 'recommendations': 3,
+                   'batch_size': 3, 'workers': 1, **options}
+        call_command('generate_load_data', stdout=io.StringIO(), **options)
+
+    def snapshot(self):
+        users = User.objects.filter(username__startswith='loadtest').order_by('username')
+        return (
+            list(users.values_list('username', 'studentprofile__skills', 'studentprofile__education_level')),
+            list(AssessmentResult.objects.filter(user__in=users)
+                 .order_by('user__username', 'assessment__title')
+                 .values_list('user__username', 'assessment__title', 'personality_type')),
+            list(CareerRecommendation.objects.filter(user__in=users)
+                 .order_by('user__username', 'rank')
+                 .values_list('user__username', 'rank', 'career_title', 'match_score')),
+        )
+
+    def test_creates_every_table(self):
+        self.generate()
+        users = User.objects.filter(username__startswith='loadtest')
+        self.assertEqual(users.count(), 7)
+        self.assertEqual(StudentProfile.objects.filter(user__in=users).count(), 7)
+        self.assertEqual(Assessment.objects.filter(questions_count=8).count(), 2)
+
+        results = AssessmentResult.objects.filter(user__in=users)
+        self.assertTrue(results.exists())
+        for result in results:
+            self.assertEqual(len(result.score), 8)
+            self.assertEqual(len(result.personality_type), 4)
+
+        for user in users:
+            self.assertEqual(list(ranked_recommendations(user).values_list('rank', flat=True)), [1, 2, 3])
+        self.assertTrue(self.client.login(username='loadtest0', password='loadtest123'))
+
+    def test_seed_reproduces_the_data(self):
+        self.generate(seed=3)
+        first = self.snapshot()
+        User.objects.filter(username__startswith='loadtest').delete()
+
+        # Batch boundaries don't change what each user gets
+        self.generate(seed=3, batch_size=5)
+        self.assertEqual(self.snapshot(), first)
+
+    def test_existing_prefix_is_refused(self):
+        User.objects.create_user(username='loadtest0')
+        with self.assertRaisesMessage(CommandError, 'already exist'):
+            self.generate()
+
+
+class RecommendationPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        fingerprint = current_fingerprint(self.user, engines.get_career_ai())
+        # Repeated scores make the id tiebreak matter
+        CareerRecommendation.objects.bulk_create([
+            CareerRecommendation(user=self.user, career_title=f'Career {index}', category='Tech',
+                                 rank=index + 1, match_score=90 - index // 3, fingerprint=fingerprint)
+            for index in range(25)
+        ])
+        self.expected = list(
+            CareerRecommendation.objects.filter(user=self.user).order_by('-match_score', 'id')
+            .values_list('career_title', flat=True)
+        )
+
+    def test_keyset_pages_cover_every_row_once(self):
+        queryset = CareerRecommendation.objects.filter(user=self.user)
+        titles, cursor = [], None
+        while True:
+            rows, cursor = keyset_page(queryset, cursor, page_size=4)
+            titles += [row.career_title for row in rows]
+            if cursor is None:
+                break
+        self.assertEqual(titles, self.expected)
+
+    def test_json_endpoint_follows_next_links(self):
+        self.client.force_login(self.user)
+        url = reverse('recommendations:recommendation_list') + '?limit=10'
+        titles, pages = [], 0
+        while url:
+            # The first page also reads the profile and personality type to check the rows are current
+            with self.assertNumQueries(3 if pages else 5):
+                page = self.client.get(url).json()
+            titles += [rec['career_title'] for rec in page['results']]
+            url, pages = page['next'], pages + 1
+        self.assertEqual(titles, self.expected)
+        self.assertEqual(pages, 3)
+
+    def test_invalid_cursor_is_rejected(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('recommendations:recommendation_list'), {'cursor': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            self.client.get(reverse('recommendations:career_paths'), {'cursor': 'bogus'}).status_code, 400
+        )
+        for payload in (b'[1,1e999]', b'[1e999,1]', b'[NaN,1]'):
+            cursor = base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+            with self.subTest(payload=payload):
+                response = self.client.get(reverse('recommendations:recommendation_list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+
+    def test_dashboard_renders_one_page(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('recommendations:recommendation_dashboard'))
+        self.assertEqual([rec.career_title for rec in response.context['recommendations']],
+                         self.expected[:PAGE_SIZE])
+        self.assertContains(response, 'load-more-recommendations')
+
+        response = self.client.get(reverse('recommendations:recommendation_dashboard'),
+                                   {'cursor': response.context['next_cursor']})
+        self.assertEqual([rec.career_title for rec in response.context['recommendations']],
+                         self.expected[PAGE_SIZE:2 * PAGE_SIZE])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked against SQLite')
+class ReadPathIndexTests(TestCase):
+    """The per-user read paths are answered from their composite indexes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index}', plan)
+        # The index order also serves the ORDER BY
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_recommendation_pages(self):
+        recommendations = CareerRecommendation.objects.filter(user=self.user)
+        self.assertUsesIndex(ranked_recommendations(self.user), 'careerrec_user_rank_idx')
+        self.assertUsesIndex(recommendations, 'careerrec_user_score_idx')
+        self.assertUsesIndex(recommendations.filter(is_favorite=True), 'careerrec_user_fav_idx')
+        self.assertIn(
+            'USING INDEX recommendations_careerrecommendation_user_id_career_title',
+            recommendations.filter(career_title='Data Scientist').explain(),
+        )
+
+    def test_keyset_pages(self):
+        queryset = CareerRecommendation.objects.filter(user=self.user, rank__isnull=False)
+        for cursor in [None, encode_cursor(CareerRecommendation(id=7, match_score=80.5))]:
+            with CaptureQueriesContext(connection) as queries:
+                keyset_page(queryset, cursor)
+            with connection.cursor() as db:
+                db.execute('EXPLAIN QUERY PLAN ' + queries[0]['sql'])
+                plan = ' '.join(str(row[-1]) for row in db.fetchall())
+            self.assertIn('careerrec_user_score_idx', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_latest_personality_type(self):
+        self.assertUsesIndex(latest_personality_types(self.user), 'result_user_completed_idx')
+
+    def test_skill_gaps_and_learning_paths(self):
+        self.assertUsesIndex(
+            SkillGapAnalysis.objects.filter(user=self.user, target_career='Data Scientist'),
+            'skillgap_user_target_idx',
+        )
+        self.assertUsesIndex(
+            LearningPath.objects.filter(user=self.user, career_target='Data Scientist'),
+            'learnpath_user_target_idx',
+        )
+
+
+class RecommendationJobTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.user_data = {'personality_type': 'INTJ', 'skills': 'Python, SQL'}
+
+    def run_worker(self, **options):
+        stdout = io.StringIO()
+        call_command('run_recommendation_worker', burst=True, stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def test_worker_completes_queued_jobs(self):
+        StudentProfile.objects.create(user=self.user, skills='Python, SQL')
+        assessment = Assessment.objects.create(
+            title='MBTI', description='', assessment_type='personality', time_required=10
+        )
+        AssessmentResult.objects.create(user=self.user, assessment=assessment, score={}, personality_type='INTJ')
+        jobs = [enqueue_recommendations(self.user, self.user_data) for _ in range(2)]
+        self.assertIn('Processed 2 jobs', self.run_worker())
+
+        expected = AdvancedCareerAI().generate_career_recommendations(self.user_data, JOB_RESULTS)
+        for job in jobs:
+            job.refresh_from_db()
+            self.assertEqual(job.status, RecommendationJob.DONE)
+            self.assertEqual(job.attempts, 1)
+            self.assertEqual(job.recommendations, expected)
+        # The result page shows the head of the dashboard's ranking
+        self.assertEqual(
+            [row.career_title for row in ranked_recommendations(self.user)[:JOB_RESULTS]],
+            [rec['career'] for rec in expected],
+        )
+
+    def test_submission_queues_the_full_scoring_inputs(self):
+        from assessments.tests import build_assessment
+
+        StudentProfile.objects.create(user=self.user, skills='Python', education_level='phd')
+        assessment = build_assessment(4)
+        self.client.force_login(self.user)
+        self.client.post(reverse('take_assessment', args=[assessment.id]), {
+            f'question_{question.id}': str(question.choices.all()[0].id)
+            for question in assessment.questions.prefetch_related('choices')
+        })
+
+        job = RecommendationJob.objects.get(user=self.user, result__isnull=False)
+        self.assertEqual(job.user_data, build_user_data(self.user))
+        self.assertEqual(job.user_data['education_level'], 'phd')
+
+    def test_profile_changes_queue_one_refresh(self):
+        profile = StudentProfile.objects.create(user=self.user, skills='Python')
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                profile.save()
+        job = RecommendationJob.objects.get(user=self.user)
+        self.assertEqual(job.user_data, {})
+
+        self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, RecommendationJob.DONE)
+        self.assertEqual(job.recommendations, [])
+        self.assertTrue(ranked_recommendations(self.user).exists())
+
+    def test_claims_are_exclusive(self):
+        first = enqueue_recommendations(self.user, self.user_data)
+        second = enqueue_recommendations(self.user, self.user_data)
+        self.assertEqual(claim_next_job('a').id, first.id)
+        self.assertEqual(claim_next_job('b').id, second.id)
+        self.assertIsNone(claim_next_job('c'))
+
+    def test_failures_are_retried_then_marked_failed(self):
+        enqueue_recommendations(self.user, self.user_data)
+        engine = mock.Mock()
+        engine.generate_career_recommendations.side_effect = ValueError('catalog unavailable')
+        with self.assertLogs('recommendations.jobs', 'ERROR'):
+            for _ in range(MAX_ATTEMPTS):
+                job = run_job(claim_next_job('worker'), engine)
+        self.assertEqual(job.status, RecommendationJob.FAILED)
+        self.assertEqual(job.error, 'ValueError: catalog unavailable')
+        self.assertIsNone(claim_next_job('worker'))
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = enqueue_recommendations(self.user, self.user_data)
+        claim_next_job('dead-worker')
+        RecommendationJob.objects.filter(id=job.id).update(
+            started_at=timezone.now() - timedelta(minutes=10)
+        )
+        self.assertEqual(requeue_stale_jobs(timeout=60), 1)
+        self.assertEqual(claim_next_job('worker').id, job.id)
+
+    def test_status_endpoint_is_private(self):
+        job = enqueue_recommendations(self.user, self.user_data)
+        url = reverse('recommendations:job_status', args=[job.id])
+
+        other = User.objects.create_user(username='other', password='secret')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).json()['status'], RecommendationJob.PENDING)
+        self.run_worker()
+        payload = self.client.get(url).json()
+        self.assertEqual(payload['status'], RecommendationJob.DONE)
+        self.assertTrue(payload['recommendations'])
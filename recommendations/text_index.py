@@ -0,0 +1,58 @@
+import joblib
+import numpy as np
+from sklearn.base import clone
+
+from .artifacts import catalog_fingerprint, csr_arrays
+
+
+def career_text(career):
+    """Free text describing a career: its skills, description and day-to-day work"""
+    return ' '.join([
+        ' '.join(career.get('skills', [])),
+        career.get('description', ''),
+        ' '.join(career.get('day_to_day', [])),
+    ])
+
+
+class CareerTextIndex:
+    """Fitted TF-IDF vectorizer plus the careers' L2-normalised vectors as a CSR matrix.
+
+    Rows are unit length, so the sparse product with a query vector is the
+    cosine similarity against every career. The index is persisted only as
+    part of the engine's career index artifact (see recommendations.artifacts).
+    """
+
+    def __init__(self, vectorizer, matrix, fingerprint):
+        self.vectorizer = vectorizer
+        self.matrix = matrix.tocsr()
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, careers, vectorizer):
+        texts = [career_text(career) for career in careers]
+        vectorizer = clone(vectorizer)
+        matrix = vectorizer.fit_transform(texts)
+        return cls(vectorizer, matrix, catalog_fingerprint(texts))
+
+    @classmethod
+    def from_artifact(cls, artifact, prefix='text'):
+        vectorizer = joblib.load(artifact.file_path(f'{prefix}_vectorizer.joblib'))
+        return cls(vectorizer, artifact.csr(f'{prefix}.matrix'), artifact.fingerprint)
+
+    def to_arrays(self, prefix='text'):
+        """Return (arrays, shapes, files) for writing this index into an artifact"""
+        files = {f'{prefix}_vectorizer.joblib': lambda path: joblib.dump(self.vectorizer, path)}
+        return csr_arrays(f'{prefix}.matrix', self.matrix), {f'{prefix}.matrix': self.matrix.shape}, files
+
+    def query(self, text, top_n=10):
+        """Return [(row, similarity)] for the careers most similar to `text`, best first"""
+        query_vec = self.vectorizer.transform([text])
+        scores = (self.matrix @ query_vec.T).toarray().ravel()
+
+        top_n = min(top_n, len(scores))
+        if top_n <= 0:
+            return []
+        candidates = np.argpartition(-scores, top_n - 1)[:top_n]
+        # Order the survivors by similarity, then catalog order
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(int(row), float(scores[row])) for row in candidates if scores[row] > 0]
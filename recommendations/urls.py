@@ -6,6 +6,7 @@ app_name = "recommendations"
 urlpatterns = [
     path("", views.recommendation_dashboard, name="recommendation_dashboard"),
     path("career-paths/", views.career_paths, name="career_paths"),
+    path("list/", views.recommendation_list, name="recommendation_list"),
     path("skill-gap-analysis/", views.skill_gap_analysis, name="skill_gap_analysis"),
     path(
         "toggle-favorite/<int:recommendation_id>/",
@@ -13,4 +14,5 @@ urlpatterns = [
         name="toggle_favorite",
     ),
     path("save-feedback/", views.save_recommendation_feedback, name="save_feedback"),
+    path("jobs/<int:job_id>/", views.recommendation_job_status, name="job_status"),
 ]
@@ -1,114 +1,145 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import HttpResponseBadRequest, JsonResponse
 
+from core.routers import replica_view, use_primary
 
+from .jobs import job_payload
+from .materialize import materialized_key, refresh_if_outdated, refresh_user_recommendations
+from .models import CareerRecommendation, RecommendationJob
+from .pagination import MAX_PAGE_SIZE, PAGE_SIZE, InvalidCursor, keyset_page, page_size_from
+
+
+def recommendation_page(request, page_size=PAGE_SIZE):
+    """(rows, next cursor) for the page named by ?cursor=; a user without rows is materialized first.
+
+    Raises InvalidCursor for a malformed cursor.
+    """
+    cursor = request.GET.get("cursor")
+    queryset = CareerRecommendation.objects.filter(user=request.user, rank__isnull=False)
+    rows, next_cursor = keyset_page(queryset, cursor, page_size)
+    if not cursor and (not rows or request.GET.get("refresh")):
+        # The rows may just not have reached the replica yet; either way the primary has them now
+        with use_primary():
+            if refresh_user_recommendations(request.user) or not rows:
+                rows, next_cursor = keyset_page(queryset, None, page_size)
+    elif not cursor:
+        # Serve the rows meanwhile; the worker rewrites them for the current catalog and scorers
+        refresh_if_outdated(request.user, rows[0].fingerprint)
+    return rows, next_cursor
+
+
+def group_by_category(recommendations):
+    categorized = {}
+    for recommendation in recommendations:
+        categorized.setdefault(recommendation.category, []).append(recommendation)
+    return categorized
+
+
+@replica_view
 @login_required
 def recommendation_dashboard(request):
-    """Simple recommendation dashboard for testing"""
-
-    # Sample data for testing
-    sample_recommendations = [
-        {
-            "id": 1,
-            "career_title": "Data Scientist",
-            "match_score": 85.5,
-            "detailed_scores": {
-                "personality": 80,
-                "skills": 70,
-                "education": 90,
-                "market": 85,
-            },
-            "missing_skills": ["Machine Learning", "Big Data", "Python Advanced"],
-            "job_growth": 31,
-            "demand_score": 95,
-            "remote_friendly": True,
-            "category": "Technology",
-            "salary_range": {"min": 80000, "max": 180000, "median": 120000},
-        },
-        {
-            "id": 2,
-            "career_title": "UX Designer",
-            "match_score": 78.2,
-            "detailed_scores": {
-                "personality": 85,
-                "skills": 65,
-                "education": 75,
-                "market": 80,
-            },
-            "missing_skills": ["User Research", "Figma", "Prototyping"],
-            "job_growth": 18,
-            "demand_score": 88,
-            "remote_friendly": True,
-            "category": "Design",
-            "salary_range": {"min": 60000, "max": 130000, "median": 85000},
-        },
-        {
-            "id": 3,
-            "career_title": "Software Engineer",
-            "match_score": 92.1,
-            "detailed_scores": {
-                "personality": 88,
-                "skills": 95,
-                "education": 85,
-                "market": 92,
-            },
-            "missing_skills": ["System Design", "Cloud Computing"],
-            "job_growth": 22,
-            "demand_score": 98,
-            "remote_friendly": True,
-            "category": "Technology",
-            "salary_range": {"min": 70000, "max": 200000, "median": 110000},
-        },
-    ]
-
-    # Sample career clusters
-    career_clusters = {
-        "Technology": [sample_recommendations[0], sample_recommendations[2]],
-        "Design": [sample_recommendations[1]],
-    }
+    """Recommendation dashboard: one keyset page of the user's materialized recommendations"""
+    try:
+        recommendations, next_cursor = recommendation_page(request)
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor")
 
     context = {
-        "recommendations": sample_recommendations,
-        "career_clusters": career_clusters,
+        "recommendations": recommendations,
+        # Group the same page by category instead of scoring a second time
+        "career_clusters": group_by_category(recommendations),
+        "cursor": request.GET.get("cursor", ""),
+        "next_cursor": next_cursor,
+        # Names the cached fragments rendered from exactly these rows
+        "recommendations_key": materialized_key(request.user.id, recommendations),
     }
 
     return render(request, "recommendations/dashboard.html", context)
 
 
+@replica_view
 @login_required
 def career_paths(request):
-    """Career paths page"""
-    return render(request, "recommendations/career_paths.html")
+    """Career paths page: a keyset page of the user's recommendations grouped by category"""
+    try:
+        recommendations, next_cursor = recommendation_page(request, page_size=MAX_PAGE_SIZE)
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor")
 
+    context = {
+        "categorized_recommendations": group_by_category(recommendations),
+        "cursor": request.GET.get("cursor", ""),
+        "next_cursor": next_cursor,
+        "recommendations_key": materialized_key(request.user.id, recommendations),
+    }
 
-@login_required
-def skill_gap_analysis(request):
-    """Skill gap analysis page"""
-    target_career = request.GET.get("career", "Data Scientist")
+    return render(request, "recommendations/career_paths.html", context)
 
-    # Sample data
-    context = {
-        "target_career": target_career,
-        "progress_percentage": 45,
-        "missing_skills": ["Machine Learning", "Python Advanced", "Statistics"],
-        "learning_path": {
-            "priority_skills": ["Python", "Machine Learning", "Statistics"],
-            "recommended_courses": [
-                "Python for Data Science",
-                "Machine Learning Fundamentals",
-                "Statistics for Data Analysis",
-            ],
-            "timeline_estimate": "3-6 months",
-            "resources": ["Data Science Handbook", "Online tutorials"],
-        },
-        "career_details": {
-            "salary_range": {"min": 80000, "max": 180000, "median": 120000},
-            "job_growth": 31,
-            "demand_score": 95,
-        },
+
+@replica_view
+@login_required
+def recommendation_list(request):
+    """JSON pages of the user's recommendations; follow `next` until it is null"""
+    try:
+        recommendations, next_cursor = recommendation_page(
+            request, page_size_from(request.GET.get("limit"))
+        )
+    except InvalidCursor as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    next_url = None
+    if next_cursor:
+        query = request.GET.copy()
+        query["cursor"] = next_cursor
+        query.pop("refresh", None)
+        next_url = f"{request.path}?{query.urlencode()}"
+
+    return JsonResponse({
+        "results": [recommendation_payload(row) for row in recommendations],
+        "next_cursor": next_cursor,
+        "next": next_url,
+    })
+
+
+def recommendation_payload(recommendation):
+    return {
+        "id": recommendation.id,
+        "career_title": recommendation.career_title,
+        "category": recommendation.category,
+        "rank": recommendation.rank,
+        "match_score": recommendation.match_score,
+        "detailed_scores": recommendation.detailed_scores,
+        "missing_skills": recommendation.missing_skills,
+        "career_details": recommendation.career_details,
+        "is_favorite": recommendation.is_favorite,
     }
 
+
+@replica_view
+@login_required
+def skill_gap_analysis(request):
+    """Skill gap analysis for one of the user's recommendations, the top match by default"""
+    recommendations = CareerRecommendation.objects.filter(user=request.user)
+    target_career = request.GET.get("career")
+    if target_career:
+        recommendation = recommendations.filter(career_title=target_career).first()
+    else:
+        recommendation = recommendations.filter(rank__isnull=False).order_by("rank").first()
+
+    context = {"target_career": None}
+    if recommendation is not None:
+        # Imported here: the scorers pull in NumPy, which URLconf loading must not
+        from .scorers import skill_score_name
+
+        context = {
+            "target_career": recommendation.career_title,
+            "progress_percentage": recommendation.detailed_scores.get(skill_score_name(), 0),
+            "missing_skills": recommendation.missing_skills,
+            "learning_path": recommendation.learning_path,
+            "career_details": recommendation.career_details,
+        }
+
     return render(request, "recommendations/skill_gap.html", context)
 
 
@@ -122,3 +153,10 @@ def toggle_favorite(request, recommendation_id):
 def save_recommendation_feedback(request):
     """Save feedback - simple version"""
     return JsonResponse({"success": True, "message": "Feedback saved!"})
+
+
+@login_required
+def recommendation_job_status(request, job_id):
+    """Polled by the assessment result page until the job is done or failed"""
+    job = get_object_or_404(RecommendationJob, id=job_id, user=request.user)
+    return JsonResponse(job_payload(job))